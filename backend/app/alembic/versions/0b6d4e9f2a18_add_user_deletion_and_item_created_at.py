@@ -0,0 +1,34 @@
+"""Add pending user deletion and Item created_at
+
+Revision ID: 0b6d4e9f2a18
+Revises: f3a8d6c1b290
+Create Date: 2026-10-18 17:34:02.118640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6d4e9f2a18'
+down_revision = 'f3a8d6c1b290'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('deletion_requested_at', sa.DateTime(timezone=True), nullable=True))
+    # Existing items count as created now, which only delays their retention
+    op.add_column('item', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+    with op.get_context().autocommit_block():
+        op.create_index('ix_user_deletion_requested_at', 'user', ['deletion_requested_at'], unique=False, postgresql_where=sa.text('deletion_requested_at IS NOT NULL'), postgresql_concurrently=True)
+        op.create_index('ix_item_created_at', 'item', ['created_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_item_created_at', table_name='item', postgresql_concurrently=True)
+        op.drop_index('ix_user_deletion_requested_at', table_name='user', postgresql_concurrently=True)
+    op.drop_column('item', 'created_at')
+    op.drop_column('user', 'deletion_requested_at')
@@ -0,0 +1,37 @@
+"""Add email_outbox table
+
+Revision ID: 2c7f9a4e1b63
+Revises: 0b6d4e9f2a18
+Create Date: 2026-10-18 18:12:47.306215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '2c7f9a4e1b63'
+down_revision = '0b6d4e9f2a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_outbox',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('email_to', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('subject', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('html_content', sa.Text(), nullable=False),
+    sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=16), server_default='pending', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_email_outbox_pending', 'email_outbox', ['next_attempt_at'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_pending', table_name='email_outbox', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_table('email_outbox')
@@ -0,0 +1,25 @@
+"""Add token_version to User
+
+Revision ID: 5f2c8e1a9b47
+Revises: 1a31ce608336
+Create Date: 2026-10-18 09:12:40.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5f2c8e1a9b47'
+down_revision = '1a31ce608336'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('user', 'token_version')
@@ -0,0 +1,105 @@
+"""Add item_count table maintained by triggers on item
+
+Revision ID: 7a9e5c2d1f83
+Revises: b3d71f40c6e2
+Create Date: 2026-10-18 13:41:09.620571
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '7a9e5c2d1f83'
+down_revision = 'b3d71f40c6e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('item_count',
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    # Statement-level triggers with transition tables: one counter update per
+    # owner per statement, so bulk inserts and cascaded deletes stay cheap.
+    # No FK to user, as the cascade from a deleted user runs the delete trigger
+    # while the user row is going away.
+    op.execute("""
+        CREATE FUNCTION item_count_add() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO item_count (owner_id, count)
+            SELECT owner_id, count(*) FROM new_rows GROUP BY owner_id
+            ON CONFLICT (owner_id)
+            DO UPDATE SET count = item_count.count + EXCLUDED.count;
+            RETURN NULL;
+        END $$
+    """)
+    op.execute("""
+        CREATE FUNCTION item_count_subtract() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE item_count AS c SET count = c.count - d.n
+            FROM (SELECT owner_id, count(*) AS n FROM old_rows GROUP BY owner_id) AS d
+            WHERE c.owner_id = d.owner_id;
+            DELETE FROM item_count
+            WHERE owner_id IN (SELECT owner_id FROM old_rows) AND count <= 0;
+            RETURN NULL;
+        END $$
+    """)
+    op.execute("""
+        CREATE FUNCTION item_count_move() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            WITH moved AS (
+                SELECT o.owner_id AS old_owner, n.owner_id AS new_owner
+                FROM old_rows AS o JOIN new_rows AS n ON n.id = o.id
+                WHERE n.owner_id <> o.owner_id
+            )
+            INSERT INTO item_count (owner_id, count)
+            SELECT owner_id, sum(n) FROM (
+                SELECT old_owner AS owner_id, -1 AS n FROM moved
+                UNION ALL
+                SELECT new_owner AS owner_id, 1 AS n FROM moved
+            ) AS changes
+            GROUP BY owner_id
+            ON CONFLICT (owner_id)
+            DO UPDATE SET count = item_count.count + EXCLUDED.count;
+            DELETE FROM item_count
+            WHERE owner_id IN (SELECT owner_id FROM old_rows) AND count <= 0;
+            RETURN NULL;
+        END $$
+    """)
+    # Keep writers out between the backfill and the triggers going live
+    op.execute("LOCK TABLE item IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+        CREATE TRIGGER item_count_insert AFTER INSERT ON item
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION item_count_add()
+    """)
+    op.execute("""
+        CREATE TRIGGER item_count_delete AFTER DELETE ON item
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION item_count_subtract()
+    """)
+    # Transition tables rule out "UPDATE OF owner_id", so the function picks
+    # out the rows whose owner changed
+    op.execute("""
+        CREATE TRIGGER item_count_update AFTER UPDATE ON item
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION item_count_move()
+    """)
+    op.execute("""
+        INSERT INTO item_count (owner_id, count)
+        SELECT owner_id, count(*) FROM item GROUP BY owner_id
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER item_count_update ON item")
+    op.execute("DROP TRIGGER item_count_delete ON item")
+    op.execute("DROP TRIGGER item_count_insert ON item")
+    op.execute("DROP FUNCTION item_count_move()")
+    op.execute("DROP FUNCTION item_count_subtract()")
+    op.execute("DROP FUNCTION item_count_add()")
+    op.drop_table('item_count')
@@ -0,0 +1,28 @@
+"""Add (owner_id, id) index on Item
+
+Revision ID: b3d71f40c6e2
+Revises: 5f2c8e1a9b47
+Create Date: 2026-10-18 11:03:27.502914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d71f40c6e2'
+down_revision = '5f2c8e1a9b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Build without blocking writes on large item tables
+    with op.get_context().autocommit_block():
+        op.create_index('ix_item_owner_id_id', 'item', ['owner_id', 'id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_item_owner_id_id', table_name='item', postgresql_concurrently=True)
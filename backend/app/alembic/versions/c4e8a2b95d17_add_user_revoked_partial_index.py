@@ -0,0 +1,30 @@
+"""Add partial index on revoked users
+
+Revision ID: c4e8a2b95d17
+Revises: 7a9e5c2d1f83
+Create Date: 2026-10-18 14:12:45.118306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a2b95d17'
+down_revision = '7a9e5c2d1f83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Item listings and per-owner deletes are served by ix_item_owner_id_id
+    # (b3d71f40c6e2). This covers the revocation list refresh, which runs
+    # every few seconds and otherwise scans the whole user table.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_user_revoked', 'user', ['id'], unique=False, postgresql_where=sa.text('is_active IS false OR token_version > 0'), postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_user_revoked', table_name='user', postgresql_concurrently=True)
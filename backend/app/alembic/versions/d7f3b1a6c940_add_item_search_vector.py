@@ -0,0 +1,38 @@
+"""Add generated full-text search vector on Item
+
+Revision ID: d7f3b1a6c940
+Revises: c4e8a2b95d17
+Create Date: 2026-10-18 15:02:51.336470
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f3b1a6c940'
+down_revision = 'c4e8a2b95d17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Adding a stored generated column rewrites the table under an exclusive
+    # lock; run this in a maintenance window on large item tables.
+    op.add_column('item', sa.Column('search', postgresql.TSVECTOR(), sa.Computed(
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+        persisted=True,
+    ), nullable=True))
+    # btree_gin lets one GIN index serve both owner-scoped and global search
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    with op.get_context().autocommit_block():
+        op.create_index('ix_item_owner_id_search', 'item', ['owner_id', 'search'], unique=False, postgresql_using='gin', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_item_owner_id_search', table_name='item', postgresql_concurrently=True)
+    op.drop_column('item', 'search')
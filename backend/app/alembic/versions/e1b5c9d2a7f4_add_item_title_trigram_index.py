@@ -0,0 +1,33 @@
+"""Add trigram index on Item title
+
+Revision ID: e1b5c9d2a7f4
+Revises: d7f3b1a6c940
+Create Date: 2026-10-18 15:47:18.904215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1b5c9d2a7f4'
+down_revision = 'd7f3b1a6c940'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # owner_id leads (btree_gin, see d7f3b1a6c940) so suggestions stay
+    # scoped to one owner's titles inside the index
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_item_owner_id_title_trgm ON item "
+            "USING gin (owner_id, title gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_item_owner_id_title_trgm', table_name='item', postgresql_concurrently=True)
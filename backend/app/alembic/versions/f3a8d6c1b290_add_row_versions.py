@@ -0,0 +1,27 @@
+"""Add row version to User and Item
+
+Revision ID: f3a8d6c1b290
+Revises: e1b5c9d2a7f4
+Create Date: 2026-10-18 16:25:40.771932
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a8d6c1b290'
+down_revision = 'e1b5c9d2a7f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('item', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('item', 'version')
+    op.drop_column('user', 'version')
@@ -1,17 +1,27 @@
-from collections.abc import Generator
+import uuid
+from collections.abc import AsyncGenerator, Generator
+from dataclasses import dataclass
 from typing import Annotated
 
-import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
-from backend.app.schemas import TokenPayload, User
+from app.core.db import async_engine, engine
+from app.core.principal_cache import cache_user, get_cached_user
+from app.core.replicas import (
+    STICKY_COOKIE,
+    RoutingSession,
+    replica_for,
+    sticks_to_primary,
+)
+from app.core.revocation import revocation_list
+from app.schemas import TokenPayload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -23,22 +33,45 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # Attributes are not expired on commit: reloading them lazily would need
+    # implicit IO, which an AsyncSession cannot do outside of an await.
+    async with AsyncSession(
+        async_engine, expire_on_commit=False, sync_session_class=RoutingSession
+    ) as session:
+        sticky = sticks_to_primary(request.cookies.get(STICKY_COOKIE))
+        session.info["request_state"] = request.state
+        session.info["replica"] = replica_for(request.method, sticky)
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def _decode_token(token: str) -> TokenPayload:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
+        return security.decode_access_token(token)
     except (InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+
+
+async def load_user(session: AsyncSession, user_id: str | uuid.UUID) -> User | None:
+    user = get_cached_user(session, user_id)
+    if not user:
+        user = await session.get(User, user_id)
+        if user:
+            cache_user(user)
+    return user
+
+
+async def get_current_user(session: AsyncSessionDep, token: TokenDep) -> User:
+    token_data = _decode_token(token)
+    user = await load_user(session, token_data.sub)  # type: ignore[arg-type]
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
@@ -49,7 +82,43 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-def get_current_active_superuser(current_user: CurrentUser) -> User:
+@dataclass(frozen=True)
+class Principal:
+    id: uuid.UUID
+    is_superuser: bool
+
+
+async def get_current_principal(session: AsyncSessionDep, token: TokenDep) -> Principal:
+    """
+    Who is calling, authorized from token claims when they are present.
+
+    Tokens without claims (or with ACCESS_TOKEN_CLAIMS disabled) fall back to
+    get_current_user.
+    """
+    token_data = _decode_token(token)
+    if (
+        settings.ACCESS_TOKEN_CLAIMS
+        and token_data.sub is not None
+        and token_data.ver is not None
+    ):
+        if revocation_list.is_revoked(token_data.sub, token_data.ver):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        if not token_data.is_active:
+            raise HTTPException(status_code=400, detail="Inactive user")
+        return Principal(
+            id=uuid.UUID(token_data.sub), is_superuser=bool(token_data.is_superuser)
+        )
+    user = await get_current_user(session, token)
+    return Principal(id=user.id, is_superuser=user.is_superuser)
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+async def get_current_active_superuser(current_user: CurrentUser) -> User:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
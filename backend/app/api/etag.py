@@ -0,0 +1,55 @@
+import hashlib
+import uuid
+from collections.abc import Iterable
+
+from fastapi import Request, Response
+
+
+def row_etag(id: uuid.UUID, version: int) -> str:
+    """
+    Strong ETag of a single row: its id and row version.
+    """
+    return f'"{id}.{version}"'
+
+
+def list_etag(
+    count: int | None, rows: Iterable[tuple[uuid.UUID, int]], *key: object
+) -> str:
+    """
+    Weak ETag of a page of rows, from the total, the highest row version and
+    the (id, version) pairs on the page; ``key`` adds the query parameters
+    that select the page. Weak because the body also depends on the total
+    and cursor, which are not versioned.
+    """
+    pairs = list(rows)
+    max_version = max((version for _, version in pairs), default=0)
+    digest = hashlib.sha256(repr((count, max_version, pairs, key)).encode())
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """
+    A 304 response when ``If-None-Match`` matches ``etag``, else None.
+
+    If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    """
+    header = request.headers.get("If-None-Match")
+    if header is None:
+        return None
+    candidates = {_strip_weak(tag.strip()) for tag in header.split(",")}
+    if "*" in candidates or _strip_weak(etag) in candidates:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Send already serialized JSON, or a 304 if the client has it.
+    """
+    return not_modified(request, etag) or Response(
+        content=body, media_type="application/json", headers={"ETag": etag}
+    )
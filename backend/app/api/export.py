@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+
+from app.core.config import settings
+from app.core.db import async_engine
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _jsonable(value: Any) -> Any:
+    return str(value) if isinstance(value, uuid.UUID) else value
+
+
+async def _rows(statement: Select[Any]) -> AsyncIterator[Sequence[Sequence[Any]]]:
+    # A connection of its own: the request's session is closed once the
+    # route returns, before the body is streamed. stream() keeps a
+    # server-side cursor open and yield_per bounds each fetch.
+    async with async_engine.connect() as connection:
+        result = await connection.stream(
+            statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+
+async def _ndjson(statement: Select[Any], fields: list[str]) -> AsyncIterator[str]:
+    async for rows in _rows(statement):
+        yield "".join(
+            json.dumps({f: _jsonable(v) for f, v in zip(fields, row, strict=True)})
+            + "\n"
+            for row in rows
+        )
+
+
+async def _csv(statement: Select[Any], fields: list[str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for rows in _rows(statement):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(
+    statement: Select[Any], fields: list[str], format: ExportFormat, filename: str
+) -> StreamingResponse:
+    """
+    Stream the rows of ``statement`` as NDJSON or CSV, one batch at a time.
+
+    ``fields`` names the selected columns, in order.
+    """
+    body = _ndjson(statement, fields) if format == "ndjson" else _csv(statement, fields)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format}"'
+        },
+    )
@@ -0,0 +1,178 @@
+import codecs
+import csv
+import json
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.schemas import ItemCreate, ItemImportError, ItemImportResult
+
+ImportFormat = Literal["ndjson", "csv"]
+
+
+async def _lines(
+    chunks: AsyncIterator[bytes], max_length: int
+) -> AsyncIterator[tuple[int, str | ValueError]]:
+    """
+    Split a UTF-8 byte stream into numbered lines without reading it whole.
+    A line longer than ``max_length`` is yielded as an error once and the
+    rest of it is skipped, so at most one line is held in memory.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    too_long = ValueError(f"Line longer than {max_length} characters")
+    pending = ""
+    number = 0
+    skipping = False
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        if skipping and lines:
+            # The end of the line that was too long
+            skipping = False
+            del lines[0]
+        for line in lines:
+            number += 1
+            yield number, too_long if len(line) > max_length else line.rstrip("\r")
+        if skipping:
+            pending = ""
+        elif len(pending) > max_length:
+            number += 1
+            yield number, too_long
+            skipping, pending = True, ""
+    pending += decoder.decode(b"", final=True)
+    if pending and not skipping:
+        yield number + 1, pending.rstrip("\r")
+
+
+async def _records(
+    chunks: AsyncIterator[bytes], format: ImportFormat
+) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Yield (line number, raw record) pairs; a record that cannot be parsed is
+    yielded as the exception describing why.
+    """
+    max_length = settings.IMPORT_MAX_LINE_LENGTH
+    if format == "ndjson":
+        async for number, line in _lines(chunks, max_length):
+            if isinstance(line, ValueError):
+                yield number, line
+                continue
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, e
+        return
+
+    header: list[str] | None = None
+    parts: list[str] = []
+    start, length = 0, 0
+    # Quotes are doubled inside quoted fields, so an odd count up to the end
+    # of a line means a quoted field runs on into the next one
+    quoted = False
+    async for number, line in _lines(chunks, max_length):
+        if isinstance(line, ValueError):
+            # Resynchronize on the line after the long one
+            yield start if parts else number, line
+            parts, length, quoted = [], 0, False
+            continue
+        if not parts:
+            start = number
+        parts.append(line)
+        length += len(line) + 1
+        if line.count('"') % 2:
+            quoted = not quoted
+        if quoted:
+            if length > max_length:
+                yield start, ValueError(f"Record longer than {max_length} characters")
+                parts, length, quoted = [], 0, False
+            continue
+        fields = next(csv.reader(["\n".join(parts)]), [])
+        parts, length = [], 0
+        if not fields:
+            continue
+        if header is None:
+            header = fields
+        elif len(fields) != len(header):
+            yield start, ValueError(f"Expected {len(header)} fields, got {len(fields)}")
+        else:
+            yield start, dict(zip(header, fields, strict=True))
+    if parts:
+        yield start, ValueError("Unterminated quoted field")
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in e['loc']) or 'row'}: {e['msg']}"
+            for e in error.errors()
+        )
+    return str(error)
+
+
+async def import_items(
+    *,
+    session: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    format: ImportFormat,
+    owner_id: uuid.UUID,
+) -> ItemImportResult:
+    """
+    Validate streamed rows against ItemCreate and COPY the valid ones into a
+    temporary staging table, IMPORT_BATCH_SIZE at a time, then merge them
+    into item in one statement. Invalid rows are reported, not fatal.
+    The caller commits.
+    """
+    await session.execute(
+        text(
+            "CREATE TEMP TABLE item_import "
+            "(title varchar(255), description varchar(255)) ON COMMIT DROP"
+        )
+    )
+    # The session's transaction is already open on this connection, so the
+    # COPY below is part of it
+    connection = await session.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+
+    errors: list[ItemImportError] = []
+    error_count = 0
+    batch: list[tuple[str, str | None]] = []
+
+    async def flush() -> None:
+        if batch:
+            await raw.copy_records_to_table(
+                "item_import", records=batch, columns=["title", "description"]
+            )
+            batch.clear()
+
+    async for line, record in _records(chunks, format):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            item_in = ItemCreate.model_validate(record)
+        except (ValidationError, ValueError) as e:
+            error_count += 1
+            if len(errors) < settings.IMPORT_MAX_ERRORS:
+                errors.append(ItemImportError(line=line, error=_describe(e)))
+            continue
+        batch.append((item_in.title, item_in.description))
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            await flush()
+    await flush()
+
+    result = await session.execute(
+        text(
+            "INSERT INTO item (id, title, description, owner_id) "
+            "SELECT gen_random_uuid(), title, description, :owner_id FROM item_import"
+        ).execution_options(writes=True),
+        {"owner_id": owner_id},
+    )
+    return ItemImportResult(
+        imported=result.rowcount, error_count=error_count, errors=errors
+    )
@@ -1,77 +1,373 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Body, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser, SessionDep
-from backend.app.schemas import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
+from app import crud
+from app.api import imports
+from app.api.deps import AsyncSessionDep, CurrentPrincipal, CurrentUser
+from app.api.etag import etag_response, list_etag, not_modified, row_etag
+from app.api.export import ExportFormat, export_response
+from app.api.serialization import dump_page, public_fields
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.response_cache import (
+    ALL_ITEMS,
+    CachedResponse,
+    invalidate_items,
+    owner_items,
+    response_cache,
+)
+from app.core.suggestion_cache import (
+    cache_suggestions,
+    get_suggestions,
+    invalidate_suggestions,
+)
+from app.schemas import (
+    CountMode,
+    Item,
+    ItemBulkResult,
+    ItemBulkResults,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemImportResult,
+    ItemPublic,
+    ItemsPublic,
+    ItemSuggestions,
+    ItemUpdate,
+    Message,
+)
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+# Listings select plain columns and serialize them with dump_page
+_ITEM_FIELDS = public_fields(ItemPublic)
+_ITEM_LIST_COLUMNS = [getattr(Item, field) for field in _ITEM_FIELDS] + [Item.version]
+
 
 @router.get("/", response_model=ItemsPublic)
-def read_items(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_items(
+    request: Request,
+    session: AsyncSessionDep,
+    current_user: CurrentPrincipal,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
+) -> Any:
+    """
+    Retrieve items, ordered by owner and id.
+
+    Pass a page's ``next_cursor`` as ``cursor`` to get the page after it
+    with an index seek instead of an offset scan; ``skip`` is ignored then.
+    ``count=estimated`` returns the planner's row estimate for superusers and
+    ``count=none`` skips the total; per-user totals are always exact.
+    Serialized pages are cached until the items they cover change.
+    """
+    scope = ALL_ITEMS if current_user.is_superuser else owner_items(current_user.id)
+    cache_key = await response_cache.key(
+        scope, current_user.id, "items", request.query_params.multi_items()
+    )
+    if cached := await response_cache.get(cache_key):
+        return etag_response(request, cached.body, cached.etag)
+
+    after = None
+    if cursor is not None:
+        try:
+            owner, item_id = decode_cursor(cursor, 2)
+            after = (uuid.UUID(owner), uuid.UUID(item_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    owner_id = None if current_user.is_superuser else current_user.id
+    count = await crud.count_items_async(
+        session=session, owner_id=owner_id, mode=count_mode
+    )
+    statement = crud.items_page_statement(
+        columns=_ITEM_LIST_COLUMNS,
+        owner_id=owner_id,
+        after=after,
+        skip=skip,
+        limit=limit,
+    )
+    items = (await session.exec(statement)).all()
+
+    etag = list_etag(
+        count,
+        [(item.id, item.version) for item in items],
+        current_user.id,
+        skip,
+        limit,
+        cursor,
+    )
+    if unchanged := not_modified(request, etag):
+        return unchanged
+
+    next_cursor = None
+    if items and len(items) == limit:
+        next_cursor = encode_cursor([items[-1].owner_id, items[-1].id])
+    body = dump_page(items, _ITEM_FIELDS, count=count, next_cursor=next_cursor)
+    await response_cache.set(cache_key, CachedResponse(body, etag))
+    return etag_response(request, body, etag)
+
+
+@router.get("/search", response_model=ItemsPublic)
+async def search_items(
+    session: AsyncSessionDep,
+    current_user: CurrentPrincipal,
+    q: Annotated[str, Query(min_length=1, max_length=255)],
+    limit: int = 100,
+    cursor: str | None = None,
+) -> Any:
+    """
+    Full-text search over item titles and descriptions, best matches first.
+
+    ``q`` takes web search syntax: quoted phrases, ``or`` and ``-word``.
+    Title matches outrank description matches. Pages are chained with
+    ``next_cursor``; no total is computed.
+    """
+    after = None
+    if cursor is not None:
+        try:
+            rank, item_id = decode_cursor(cursor, 2)
+            after = (float(rank), uuid.UUID(item_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    statement = crud.search_items_statement(
+        q=q,
+        owner_id=None if current_user.is_superuser else current_user.id,
+        after=after,
+        limit=limit,
+    )
+    rows = (await session.exec(statement)).all()
+
+    next_cursor = None
+    if rows and len(rows) == limit:
+        item, rank = rows[-1]
+        next_cursor = encode_cursor([rank, item.id])
+    return ItemsPublic(
+        data=[item for item, _ in rows], count=None, next_cursor=next_cursor
+    )
+
+
+@router.get("/suggest", response_model=ItemSuggestions)
+async def suggest_items(
+    session: AsyncSessionDep,
+    current_user: CurrentPrincipal,
+    prefix: Annotated[str, Query(min_length=1, max_length=255)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
 ) -> Any:
     """
-    Retrieve items.
+    Titles of the current user's items starting with ``prefix``, ignoring
+    case, for type-ahead. Recent prefixes are answered from memory.
+    """
+    titles = get_suggestions(current_user.id, prefix, limit)
+    if titles is None:
+        statement = crud.suggest_items_statement(
+            owner_id=current_user.id, prefix=prefix, limit=limit
+        )
+        titles = list((await session.exec(statement)).all())
+        cache_suggestions(current_user.id, prefix, limit, titles)
+    return ItemSuggestions(data=titles)
+
+
+@router.get("/export")
+async def export_items(
+    current_user: CurrentPrincipal, format: ExportFormat = "ndjson"
+) -> StreamingResponse:
+    """
+    Stream all items visible to the current user as NDJSON or CSV.
     """
+    fields = ["id", "title", "description", "owner_id"]
+    statement = select(Item.id, Item.title, Item.description, Item.owner_id)
+    if not current_user.is_superuser:
+        statement = statement.where(Item.owner_id == current_user.id)
+    statement = statement.order_by(col(Item.owner_id), col(Item.id))
+    return export_response(statement, fields, format, "items")
 
-    if current_user.is_superuser:
-        count_statement = select(func.count()).select_from(Item)
-        count = session.exec(count_statement).one()
-        statement = select(Item).offset(skip).limit(limit)
-        items = session.exec(statement).all()
-    else:
-        count_statement = (
-            select(func.count())
-            .select_from(Item)
-            .where(Item.owner_id == current_user.id)
+
+def _check_bulk_size(rows: list[Any]) -> None:
+    if len(rows) > settings.ITEMS_BULK_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.ITEMS_BULK_MAX} items per request",
         )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Item)
-            .where(Item.owner_id == current_user.id)
-            .offset(skip)
-            .limit(limit)
+
+
+def _check_unique_ids(ids: list[uuid.UUID]) -> None:
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Duplicate item ids")
+
+
+async def _missing_results(
+    session: AsyncSession, ids: list[uuid.UUID]
+) -> dict[uuid.UUID, ItemBulkResult]:
+    """
+    Tell ids that do not exist from ids owned by someone else.
+    """
+    if not ids:
+        return {}
+    existing = await crud.existing_item_ids_async(session=session, ids=ids)
+    return {
+        id: ItemBulkResult(id=id, status="forbidden" if id in existing else "not_found")
+        for id in ids
+    }
+
+
+@router.post("/bulk", response_model=ItemBulkResults)
+async def create_items(
+    *, session: AsyncSessionDep, current_user: CurrentUser, items_in: list[ItemCreate]
+) -> Any:
+    """
+    Create many items in one transaction.
+    """
+    _check_bulk_size(items_in)
+    items = await crud.create_items_async(
+        session=session, items_in=items_in, owner_id=current_user.id
+    )
+    await session.commit()
+    invalidate_suggestions(current_user.id)
+    await invalidate_items(current_user.id)
+    return ItemBulkResults(
+        data=[
+            ItemBulkResult(
+                id=item.id, status="created", item=ItemPublic.model_validate(item)
+            )
+            for item in items
+        ]
+    )
+
+
+@router.patch("/bulk", response_model=ItemBulkResults)
+async def update_items(
+    *,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    items_in: list[ItemBulkUpdate],
+) -> Any:
+    """
+    Update many items in one transaction. Items that do not exist or belong
+    to someone else are reported and left alone.
+    """
+    _check_bulk_size(items_in)
+    ids = [item_in.id for item_in in items_in]
+    _check_unique_ids(ids)
+    owner_id = None if current_user.is_superuser else current_user.id
+    items = await crud.update_items_async(
+        session=session, items_in=items_in, owner_id=owner_id
+    )
+    updated = {
+        item.id: ItemBulkResult(
+            id=item.id, status="updated", item=ItemPublic.model_validate(item)
         )
-        items = session.exec(statement).all()
+        for item in items
+    }
+    results = updated | await _missing_results(
+        session, [id for id in ids if id not in updated]
+    )
+    await session.commit()
+    owners = {item.owner_id for item in items}
+    invalidate_suggestions(*owners)
+    await invalidate_items(*owners)
+    return ItemBulkResults(data=[results[id] for id in ids])
+
+
+@router.delete("/bulk", response_model=ItemBulkResults)
+async def delete_items(
+    *,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    ids: list[uuid.UUID] = Body(),
+) -> Any:
+    """
+    Delete many items in one transaction. Items that do not exist or belong
+    to someone else are reported and left alone.
+    """
+    _check_bulk_size(ids)
+    _check_unique_ids(ids)
+    owner_id = None if current_user.is_superuser else current_user.id
+    deleted = await crud.delete_items_async(session=session, ids=ids, owner_id=owner_id)
+    results = {id: ItemBulkResult(id=id, status="deleted") for id in deleted}
+    results |= await _missing_results(session, [id for id in ids if id not in deleted])
+    await session.commit()
+    owners = set(deleted.values())
+    invalidate_suggestions(*owners)
+    await invalidate_items(*owners)
+    return ItemBulkResults(data=[results[id] for id in ids])
 
-    return ItemsPublic(data=items, count=count)
+
+@router.post("/import", response_model=ItemImportResult)
+async def import_items(
+    *,
+    request: Request,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    format: imports.ImportFormat = "ndjson",
+) -> Any:
+    """
+    Import items from a streamed NDJSON or CSV (with a header row) request
+    body, owned by the current user. Rows that fail validation are listed
+    with their line number; the others are imported.
+    """
+    result = await imports.import_items(
+        session=session,
+        chunks=request.stream(),
+        format=format,
+        owner_id=current_user.id,
+    )
+    await session.commit()
+    invalidate_suggestions(current_user.id)
+    await invalidate_items(current_user.id)
+    return result
 
 
 @router.get("/{id}", response_model=ItemPublic)
-def read_item(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+async def read_item(
+    request: Request,
+    response: Response,
+    session: AsyncSessionDep,
+    current_user: CurrentPrincipal,
+    id: uuid.UUID,
+) -> Any:
     """
-    Get item by ID.
+    Get item by ID. Answers 304 when ``If-None-Match`` holds its ETag.
     """
-    item = session.get(Item, id)
+    item = await session.get(Item, id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     if not current_user.is_superuser and (item.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
+    etag = row_etag(item.id, item.version)
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers["ETag"] = etag
     return item
 
 
 @router.post("/", response_model=ItemPublic)
-def create_item(
-    *, session: SessionDep, current_user: CurrentUser, item_in: ItemCreate
+async def create_item(
+    *, session: AsyncSessionDep, current_user: CurrentUser, item_in: ItemCreate
 ) -> Any:
     """
     Create new item.
     """
     item = Item.model_validate(item_in, update={"owner_id": current_user.id})
     session.add(item)
-    session.commit()
-    session.refresh(item)
+    await session.commit()
+    invalidate_suggestions(item.owner_id)
+    await invalidate_items(item.owner_id)
+    await session.refresh(item)
     return item
 
 
 @router.put("/{id}", response_model=ItemPublic)
-def update_item(
+async def update_item(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     current_user: CurrentUser,
     id: uuid.UUID,
     item_in: ItemUpdate,
@@ -79,31 +375,34 @@ def update_item(
     """
     Update an item.
     """
-    item = session.get(Item, id)
-    if not item:
+    owner_id = None if current_user.is_superuser else current_user.id
+    row = await crud.update_item_async(
+        session=session, item_id=id, item_in=item_in, owner_id=owner_id
+    )
+    if not row:
         raise HTTPException(status_code=404, detail="Item not found")
-    if not current_user.is_superuser and (item.owner_id != current_user.id):
+    if row.id is None:
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    update_dict = item_in.model_dump(exclude_unset=True)
-    item.sqlmodel_update(update_dict)
-    session.add(item)
-    session.commit()
-    session.refresh(item)
-    return item
+    await session.commit()
+    invalidate_suggestions(row.owner_id)
+    await invalidate_items(row.owner_id)
+    return row._asdict()
 
 
 @router.delete("/{id}")
-def delete_item(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+async def delete_item(
+    session: AsyncSessionDep, current_user: CurrentUser, id: uuid.UUID
 ) -> Message:
     """
     Delete an item.
     """
-    item = session.get(Item, id)
-    if not item:
+    owner_id = None if current_user.is_superuser else current_user.id
+    row = await crud.delete_item_async(session=session, item_id=id, owner_id=owner_id)
+    if not row:
         raise HTTPException(status_code=404, detail="Item not found")
-    if not current_user.is_superuser and (item.owner_id != current_user.id):
+    if row.owner_id is None:
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    session.delete(item)
-    session.commit()
+    await session.commit()
+    invalidate_suggestions(row.owner_id)
+    await invalidate_items(row.owner_id)
     return Message(message="Item deleted successfully")
@@ -3,9 +3,10 @@ from typing import Any
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from app.api.deps import SessionDep
-from app.core.security import get_password_hash
-from backend.app.schemas import (
+from app.api.deps import AsyncSessionDep
+from app.core.response_cache import USERS, response_cache
+from app.core.security import get_password_hash_async
+from app.schemas import (
     User,
     UserPublic,
 )
@@ -21,7 +22,7 @@ class PrivateUserCreate(BaseModel):
 
 
 @router.post("/users/", response_model=UserPublic)
-def create_user(user_in: PrivateUserCreate, session: SessionDep) -> Any:
+async def create_user(user_in: PrivateUserCreate, session: AsyncSessionDep) -> Any:
     """
     Create a new user.
     """
@@ -29,10 +30,11 @@ def create_user(user_in: PrivateUserCreate, session: SessionDep) -> Any:
     user = User(
         email=user_in.email,
         full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
     )
 
     session.add(user)
-    session.commit()
+    await session.commit()
+    await response_cache.invalidate(USERS)
 
     return user
@@ -1,19 +1,35 @@
 import uuid
-from typing import Any
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import col, select
 
 from app import crud
 from app.api.deps import (
+    AsyncSessionDep,
+    CurrentPrincipal,
     CurrentUser,
-    SessionDep,
     get_current_active_superuser,
+    load_user,
 )
+from app.api.etag import etag_response, list_etag, not_modified, row_etag
+from app.api.export import ExportFormat, export_response
+from app.api.serialization import dump_page, public_fields
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
-from backend.app.schemas import (
-    Item,
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.principal_cache import invalidate_user
+from app.core.response_cache import (
+    USERS,
+    CachedResponse,
+    invalidate_items,
+    response_cache,
+)
+from app.core.revocation import REVOKED, revocation_list
+from app.core.security import get_password_hash_async, verify_password_async
+from app.schemas import (
+    CountMode,
     Message,
     UpdatePassword,
     User,
@@ -24,110 +40,169 @@ from backend.app.schemas import (
     UserUpdate,
     UserUpdateMe,
 )
-from app.utils import generate_new_account_email, send_email
+from app.utils import generate_new_account_email
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# Listings select plain columns and serialize them with dump_page
+_USER_FIELDS = public_fields(UserPublic)
+_USER_LIST_COLUMNS = [getattr(User, field) for field in _USER_FIELDS] + [User.version]
+
 
 @router.get(
     "/",
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+async def read_users(
+    request: Request,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    count_mode: Annotated[CountMode, Query(alias="count")] = "exact",
+) -> Any:
     """
-    Retrieve users.
+    Retrieve users, ordered by email.
+
+    Pass a page's ``next_cursor`` as ``cursor`` to get the page after it
+    with an index seek instead of an offset scan; ``skip`` is ignored then.
+    Emails are unique, so they alone make the order total. ``count`` picks
+    an exact total, the planner's estimate or none at all. Serialized pages
+    are cached until a user changes.
     """
+    cache_key = await response_cache.key(
+        USERS, current_user.id, "users", request.query_params.multi_items()
+    )
+    if cached := await response_cache.get(cache_key):
+        return etag_response(request, cached.body, cached.etag)
 
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
+    after = None
+    if cursor is not None:
+        try:
+            (after,) = decode_cursor(cursor, 1)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
+    count = await crud.count_users_async(session=session, mode=count_mode)
 
-    return UsersPublic(data=users, count=count)
+    statement = crud.users_page_statement(
+        columns=_USER_LIST_COLUMNS, after=after, skip=skip, limit=limit
+    )
+    users = (await session.exec(statement)).all()
+
+    etag = list_etag(
+        count, [(user.id, user.version) for user in users], skip, limit, cursor
+    )
+    if unchanged := not_modified(request, etag):
+        return unchanged
+
+    next_cursor = None
+    if users and len(users) == limit:
+        next_cursor = encode_cursor([users[-1].email])
+    body = dump_page(users, _USER_FIELDS, count=count, next_cursor=next_cursor)
+    await response_cache.set(cache_key, CachedResponse(body, etag))
+    return etag_response(request, body, etag)
 
 
 @router.post(
     "/", dependencies=[Depends(get_current_active_superuser)], response_model=UserPublic
 )
-def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
+async def create_user(*, session: AsyncSessionDep, user_in: UserCreate) -> Any:
     """
     Create new user.
     """
-    hashed_password = get_password_hash(user_in.password)
-    user = crud.create_user(session=session, user_create=user_in, hashed_password=hashed_password)
+    user = await crud.get_user_by_email_async(session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system.",
         )
 
-    user = crud.create_user(session=session, user_create=user_in)
     if settings.emails_enabled and user_in.email:
         email_data = generate_new_account_email(
             email_to=user_in.email, username=user_in.email, password=user_in.password
         )
-        send_email(
-            email_to=user_in.email,
-            subject=email_data.subject,
-            html_content=email_data.html_content,
+        # Committed along with the user
+        crud.enqueue_email(
+            session=session, email_to=user_in.email, email_data=email_data
         )
+    user = await crud.create_user_async(session=session, user_create=user_in)
+    await response_cache.invalidate(USERS)
     return user
 
 
 @router.patch("/me", response_model=UserPublic)
-def update_user_me(
-    *, session: SessionDep, user_in: UserUpdateMe, current_user: CurrentUser
+async def update_user_me(
+    *, session: AsyncSessionDep, user_in: UserUpdateMe, current_user: CurrentUser
 ) -> Any:
     """
     Update own user.
     """
-
-    if user_in.email:
-        existing_user = crud.get_user_by_email(session=session, email=user_in.email)
-        if existing_user and existing_user.id != current_user.id:
-            raise HTTPException(
-                status_code=409, detail="User with this email already exists"
-            )
-    user_data = user_in.model_dump(exclude_unset=True)
-    current_user.sqlmodel_update(user_data)
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
-    return current_user
+    try:
+        result = await crud.update_user_async(
+            session=session, user_id=current_user.id, user_in=user_in
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409, detail="User with this email already exists"
+        )
+    if not result:
+        raise HTTPException(status_code=404, detail="User not found")
+    await session.commit()
+    invalidate_user(current_user.id)
+    await response_cache.invalidate(USERS)
+    user, _ = result
+    return user
 
 
 @router.patch("/me/password", response_model=Message)
-def update_password_me(
-    *, session: SessionDep, body: UpdatePassword, current_user: CurrentUser
+async def update_password_me(
+    *, session: AsyncSessionDep, body: UpdatePassword, current_user: CurrentUser
 ) -> Any:
     """
     Update own password.
     """
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password_async(
+        body.current_password, current_user.hashed_password
+    ):
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
+    hashed_password = await get_password_hash_async(body.new_password)
     current_user.hashed_password = hashed_password
     session.add(current_user)
-    session.commit()
+    await session.commit()
+    invalidate_user(current_user.id)
+    await response_cache.invalidate(USERS)
     return Message(message="Password updated successfully")
 
 
 @router.get("/me", response_model=UserPublic)
-def read_user_me(current_user: CurrentUser) -> Any:
+async def read_user_me(
+    request: Request,
+    response: Response,
+    session: AsyncSessionDep,
+    principal: CurrentPrincipal,
+) -> Any:
     """
-    Get current user.
+    Get current user. Answers 304 when ``If-None-Match`` holds its ETag.
     """
-    return current_user
+    user = await load_user(session, principal.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    etag = row_etag(user.id, user.version)
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers["ETag"] = etag
+    return user
 
 
 @router.delete("/me", response_model=Message)
-def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
+async def delete_user_me(session: AsyncSessionDep, current_user: CurrentUser) -> Any:
     """
     Delete own user.
     """
@@ -135,43 +210,67 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    session.delete(current_user)
-    session.commit()
+    await crud.request_user_deletion_async(session=session, user_id=current_user.id)
+    await session.commit()
+    invalidate_user(current_user.id)
+    revocation_list.revoke(current_user.id)
+    await response_cache.invalidate(USERS)
+    await invalidate_items(current_user.id)
     return Message(message="User deleted successfully")
 
 
 @router.post("/signup", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserRegister) -> Any:
+async def register_user(session: AsyncSessionDep, user_in: UserRegister) -> Any:
     """
     Create new user without the need to be logged in.
     """
-    user = crud.get_user_by_email(session=session, email=user_in.email)
+    user = await crud.get_user_by_email_async(session=session, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
     user_create = UserCreate.model_validate(user_in)
-    hashed_password = get_password_hash(user_in.password)
-    user = crud.create_user(session=session, user_create=user_create, hashed_password=hashed_password)
+    user = await crud.create_user_async(session=session, user_create=user_create)
+    await response_cache.invalidate(USERS)
     return user
 
 
+@router.get("/export", dependencies=[Depends(get_current_active_superuser)])
+async def export_users(format: ExportFormat = "ndjson") -> StreamingResponse:
+    """
+    Stream all users as NDJSON or CSV.
+    """
+    fields = ["id", "email", "full_name", "is_active", "is_superuser"]
+    statement = select(
+        User.id, User.email, User.full_name, User.is_active, User.is_superuser
+    ).order_by(col(User.email))
+    return export_response(statement, fields, format, "users")
+
+
 @router.get("/{user_id}", response_model=UserPublic)
-def read_user_by_id(
-    user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+async def read_user_by_id(
+    request: Request,
+    response: Response,
+    user_id: uuid.UUID,
+    session: AsyncSessionDep,
+    current_user: CurrentUser,
 ) -> Any:
     """
-    Get a specific user by id.
+    Get a specific user by id. Answers 304 when ``If-None-Match`` holds its
+    ETag.
     """
-    user = session.get(User, user_id)
-    if user == current_user:
-        return user
-    if not current_user.is_superuser:
+    user = await session.get(User, user_id)
+    if user != current_user and not current_user.is_superuser:
         raise HTTPException(
             status_code=403,
             detail="The user doesn't have enough privileges",
         )
+    if user:
+        etag = row_etag(user.id, user.version)
+        if cached := not_modified(request, etag):
+            return cached
+        response.headers["ETag"] = etag
     return user
 
 
@@ -180,9 +279,9 @@ def read_user_by_id(
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UserPublic,
 )
-def update_user(
+async def update_user(
     *,
-    session: SessionDep,
+    session: AsyncSessionDep,
     user_id: uuid.UUID,
     user_in: UserUpdate,
 ) -> Any:
@@ -190,39 +289,47 @@ def update_user(
     Update a user.
     """
 
-    db_user = session.get(User, user_id)
-    if not db_user:
+    try:
+        result = await crud.update_user_async(
+            session=session, user_id=user_id, user_in=user_in
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409, detail="User with this email already exists"
+        )
+    if not result:
         raise HTTPException(
             status_code=404,
             detail="The user with this id does not exist in the system",
         )
-    if user_in.email:
-        existing_user = crud.get_user_by_email(session=session, email=user_in.email)
-        if existing_user and existing_user.id != user_id:
-            raise HTTPException(
-                status_code=409, detail="User with this email already exists"
-            )
-
-    db_user = crud.update_user(session=session, db_user=db_user, user_in=user_in)
+    await session.commit()
+    db_user, privileges_changed = result
+    invalidate_user(user_id)
+    await response_cache.invalidate(USERS)
+    if privileges_changed:
+        revocation_list.revoke(
+            user_id, db_user.token_version if db_user.is_active else REVOKED
+        )
     return db_user
 
 
 @router.delete("/{user_id}", dependencies=[Depends(get_current_active_superuser)])
-def delete_user(
-    session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID
+async def delete_user(
+    session: AsyncSessionDep, current_user: CurrentUser, user_id: uuid.UUID
 ) -> Message:
     """
-    Delete a user.
+    Delete a user. The user is deactivated at once; their items and the user
+    itself are removed in the background by app.core.purge.
     """
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if user == current_user:
+    if user_id == current_user.id:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    statement = delete(Item).where(col(Item.owner_id) == user_id)
-    session.exec(statement)  # type: ignore
-    session.delete(user)
-    session.commit()
+    if not await crud.request_user_deletion_async(session=session, user_id=user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    await session.commit()
+    invalidate_user(user_id)
+    revocation_list.revoke(user_id)
+    await response_cache.invalidate(USERS)
+    await invalidate_items(user_id)
     return Message(message="User deleted successfully")
@@ -1,9 +1,28 @@
 from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
-from app.api.deps import get_current_active_superuser
-from backend.app.schemas import Message
-from app.utils import generate_test_email, send_email
+from app import crud
+from app.api.deps import AsyncSessionDep, get_current_active_superuser
+from app.core.config import settings
+from app.core.db import async_engine, engine, pool_status
+from app.core.outbox import outbox_sender
+from app.core.principal_cache import principal_cache
+from app.core.purge import purge_engine
+from app.core.security import password_hash_pool_stats, token_cache_stats
+from app.core.smtp import smtp_pool
+from app.core.replicas import replica_set
+from app.core.response_cache import response_cache
+from app.schemas import (
+    CacheStats,
+    DBPoolStatus,
+    EmailOutboxStats,
+    Message,
+    PasswordHashPoolStats,
+    PurgeProgress,
+    ResponseCacheStats,
+    SMTPPoolStats,
+)
+from app.utils import generate_test_email
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
@@ -13,19 +32,131 @@ router = APIRouter(prefix="/utils", tags=["utils"])
     dependencies=[Depends(get_current_active_superuser)],
     status_code=201,
 )
-def test_email(email_to: EmailStr) -> Message:
+async def test_email(session: AsyncSessionDep, email_to: EmailStr) -> Message:
     """
     Test emails.
     """
+    assert settings.emails_enabled, "no provided configuration for email variables"
     email_data = generate_test_email(email_to=email_to)
-    send_email(
-        email_to=email_to,
-        subject=email_data.subject,
-        html_content=email_data.html_content,
-    )
+    crud.enqueue_email(session=session, email_to=email_to, email_data=email_data)
+    await session.commit()
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/email-outbox/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=EmailOutboxStats,
+)
+async def read_email_outbox_stats() -> EmailOutboxStats:
+    """
+    Emails waiting to be sent, and emails given up on after every retry.
+    """
+    return EmailOutboxStats.model_validate(await outbox_sender.stats())
+
+
+@router.get(
+    "/db-pool/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=list[DBPoolStatus],
+)
+async def read_db_pool_status() -> list[DBPoolStatus]:
+    """
+    Connection pool usage of this worker process.
+    """
+    pools = [
+        DBPoolStatus.model_validate({"name": "sync", **pool_status(engine)}),
+        DBPoolStatus.model_validate(
+            {"name": "async", **pool_status(async_engine.sync_engine)}
+        ),
+    ]
+    for i, replica in enumerate(replica_set.engines):
+        pools.append(
+            DBPoolStatus.model_validate(
+                {
+                    "name": f"replica-{i}",
+                    "healthy": replica_set.is_healthy(replica),
+                    **pool_status(replica.sync_engine),
+                }
+            )
+        )
+    return pools
+
+
+@router.get(
+    "/principal-cache/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=CacheStats,
+)
+async def read_principal_cache_stats() -> CacheStats:
+    """
+    Hit and miss counters of this worker's authenticated user cache.
+    """
+    return CacheStats.model_validate(principal_cache.stats())
+
+
+@router.get(
+    "/token-cache/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=CacheStats,
+)
+async def read_token_cache_stats() -> CacheStats:
+    """
+    Hit and miss counters of this worker's verified token cache.
+    """
+    return CacheStats.model_validate(token_cache_stats())
+
+
+@router.get(
+    "/response-cache/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=ResponseCacheStats,
+)
+async def read_response_cache_stats() -> ResponseCacheStats:
+    """
+    Hit rate of this worker's list response cache.
+    """
+    return ResponseCacheStats.model_validate(response_cache.stats())
+
+
+@router.get(
+    "/smtp-pool/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=SMTPPoolStats,
+)
+async def read_smtp_pool_stats() -> SMTPPoolStats:
+    """
+    Connection reuse and per-message send latency of this worker's SMTP pool.
+    """
+    return SMTPPoolStats.model_validate(smtp_pool.stats())
+
+
+@router.get(
+    "/purge/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=list[PurgeProgress],
+)
+async def read_purge_progress() -> list[PurgeProgress]:
+    """
+    Progress of the purges recently run by this worker, oldest first.
+    Progress is kept in memory per worker, so with several workers each
+    request only sees the purges of the worker that answers it.
+    """
+    return [PurgeProgress.model_validate(p) for p in purge_engine.progress()]
+
+
+@router.get(
+    "/password-hashing/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PasswordHashPoolStats,
+)
+async def read_password_hashing_stats() -> PasswordHashPoolStats:
+    """
+    Queue depth and latency of this worker's password hashing pool.
+    """
+    return PasswordHashPoolStats.model_validate(password_hash_pool_stats())
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
@@ -14,6 +14,7 @@ from pydantic import (
 )
 from pydantic_core import MultiHostUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
 from typing_extensions import Self
 
 
@@ -35,6 +36,33 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    # Authenticated users are cached per worker to skip a lookup per request
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    # Verified access tokens kept in memory until they expire
+    TOKEN_CACHE_SIZE: int = 10_000
+    # Per-user LRU of recent /items/suggest prefixes
+    SUGGEST_CACHE_USERS: int = 1000
+    SUGGEST_CACHE_PREFIXES: int = 64
+    SUGGEST_CACHE_TTL_SECONDS: float = 60.0
+    # Serialized /items/ and /users/ pages. "redis" shares entries and
+    # invalidations between workers and needs the redis extra; "memory"
+    # invalidates per process, so app.launcher refuses it with several workers
+    RESPONSE_CACHE_BACKEND: Literal["memory", "redis", "none"] = "none"
+    RESPONSE_CACHE_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_SIZE: int = 10_000
+    RESPONSE_CACHE_TTL_SECONDS: float = 10.0
+    # Embed is_active/is_superuser/token version in access tokens so read-only
+    # routes can authorize without loading the user. Revocations are picked up
+    # from the database every TOKEN_REVOCATION_REFRESH_SECONDS.
+    ACCESS_TOKEN_CLAIMS: bool = False
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = 5.0
+    # bcrypt runs in a process pool; requests beyond MAX_PENDING get a 503.
+    # Each app.launcher worker has its own pool, so up to WEB_CONCURRENCY x
+    # PASSWORD_HASH_WORKERS processes hash at once: with one worker per CPU
+    # by default, twice as many as there are CPUs, next to the workers.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
 
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
@@ -49,6 +77,10 @@ class Settings(BaseSettings):
 
     PROJECT_NAME: str = "AI Content Generator"
     SENTRY_DSN: HttpUrl | None = None
+    # Ceiling for what importing app.main adds on top of FastAPI and
+    # SQLModel, checked by app/tests/test_import_time.py; workers are
+    # started on demand
+    IMPORT_TIME_BUDGET_MS: int = 1500
 
     # DATABASE SETTINGS (must be defined in .env)
     POSTGRES_SERVER: str = Field(..., alias="POSTGRES_SERVER")  # e.g., "db"
@@ -57,6 +89,44 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = Field(..., alias="POSTGRES_PASSWORD")
     POSTGRES_DB: str = Field(..., alias="POSTGRES_DB")
 
+    # app.launcher: worker processes (CPUs available when unset), recycled
+    # after WORKER_MAX_REQUESTS requests (plus up to the jitter, so workers
+    # do not restart together) or once their RSS passes WORKER_MAX_RSS_MB
+    WEB_CONCURRENCY: int | None = None
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WORKER_MAX_REQUESTS: int | None = None
+    WORKER_MAX_REQUESTS_JITTER: int = 0
+    WORKER_MAX_RSS_MB: int | None = None
+    WORKER_GRACEFUL_TIMEOUT_SECONDS: float = 30.0
+    # Workers that fail to boot are respawned with an exponential backoff;
+    # the launcher exits after this many failures in a row
+    WORKER_MAX_BOOT_FAILURES: int = 5
+
+    # Connection pool, applied per engine and therefore per worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 disables recycling
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = False
+    # Rows fetched per server-side cursor round trip by the export endpoints
+    EXPORT_BATCH_SIZE: int = 1000
+    # Most rows accepted by one /items/bulk request
+    ITEMS_BULK_MAX: int = 1000
+    # /items/import COPYs valid rows in batches and lists this many bad rows
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 1000
+    # Longest line, and CSV record spanning lines, in characters; longer ones
+    # are reported as errors and skipped
+    IMPORT_MAX_LINE_LENGTH: int = 65536
+    # Deleted users' items, and items older than ITEM_RETENTION_DAYS when set,
+    # are purged in the background, PURGE_BATCH_SIZE rows per transaction
+    PURGE_BATCH_SIZE: int = 1000
+    PURGE_BATCH_DELAY_SECONDS: float = 0.05
+    PURGE_INTERVAL_SECONDS: float = 10.0
+    ITEM_RETENTION_DAYS: int | None = None
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -69,6 +139,35 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> PostgresDsn:
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_SERVER,
+            port=self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
+    # Read replicas, as postgresql:// DSNs. GET requests are served from them
+    # unless the same client wrote within REPLICA_STICKY_SECONDS, which a
+    # signed cookie set on the write's response tells any worker.
+    POSTGRES_REPLICA_URIS: list[str] = []
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 5.0
+    REPLICA_STICKY_SECONDS: float = 5.0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_ASYNC_URIS(self) -> list[str]:
+        return [
+            make_url(uri).set(drivername="postgresql+asyncpg").render_as_string(
+                hide_password=False
+            )
+            for uri in self.POSTGRES_REPLICA_URIS
+        ]
+
     # EMAIL SETTINGS
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
@@ -78,6 +177,12 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str | None = None
     EMAILS_FROM_EMAIL: EmailStr | None = None
     EMAILS_FROM_NAME: str | None = None
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    # Logged-in connections are reused for up to SMTP_POOL_MAX_MESSAGES
+    # messages, and dropped after SMTP_POOL_IDLE_TIMEOUT_SECONDS unused
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_IDLE_TIMEOUT_SECONDS: float = 60.0
+    SMTP_POOL_MAX_MESSAGES: int = 100
 
     @model_validator(mode="after")
     def _set_default_emails_from(self) -> Self:
@@ -86,6 +191,19 @@ class Settings(BaseSettings):
         return self
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # Compiled email templates are cached here across restarts; the system
+    # temp directory when unset
+    EMAIL_TEMPLATE_CACHE_DIR: str | None = None
+    # Emails go through the email_outbox table; failed sends are retried
+    # after EMAIL_OUTBOX_BACKOFF_SECONDS, doubling up to the max, and marked
+    # dead after EMAIL_OUTBOX_MAX_ATTEMPTS
+    EMAIL_OUTBOX_BATCH_SIZE: int = 100
+    EMAIL_OUTBOX_POLL_SECONDS: float = 1.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 5.0
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: float = 3600.0
+    # A claimed message is offered again if its sender dies before this
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 300.0
 
     @computed_field  # type: ignore[prop-decorator]
     @property
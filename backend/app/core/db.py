@@ -1,10 +1,75 @@
+import time
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
 from sqlmodel import Session, create_engine, select
 
 from app.core.config import settings
+from app.core.metrics import Histogram
 from app.schemas import User, UserCreate
-from app.crud.user import create_user
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+class _CheckoutTimingMixin:
+    """Record how long each checkout waited for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc, no-any-return]
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options() -> dict[str, Any]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+    }
+
+
+def make_engine(url: str) -> Engine:
+    return create_engine(url, poolclass=InstrumentedQueuePool, **_pool_options())
+
+
+def make_async_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url, poolclass=InstrumentedAsyncAdaptedQueuePool, **_pool_options()
+    )
+
+
+def pool_status(db_engine: Engine) -> dict[str, Any]:
+    pool = db_engine.pool
+    assert isinstance(pool, _CheckoutTimingMixin)
+    assert isinstance(pool, QueuePool)
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkout_wait": pool.checkout_wait.snapshot(),
+    }
+
+
+engine = make_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+async_engine = make_async_engine(str(settings.SQLALCHEMY_ASYNC_DATABASE_URI))
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -25,9 +90,12 @@ def init_db(session: Session) -> None:
         select(User).where(User.email == settings.FIRST_SUPERUSER)
     ).first()
     if not user:
+        # Imported here so the engine can be used without loading crud
+        from app import crud
+
         user_in = UserCreate(
             email=settings.FIRST_SUPERUSER,
             password=settings.FIRST_SUPERUSER_PASSWORD,
             is_superuser=True,
         )
-        user = create_user(db=session, user_create=user_in)  # ✅ Use correct call
+        user = crud.create_user(session=session, user_create=user_in)
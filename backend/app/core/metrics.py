@@ -0,0 +1,52 @@
+import bisect
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+# Upper bounds in seconds, tuned for waits that are usually sub-millisecond
+# but can stretch up to a pool or queue timeout.
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    30.0,
+)
+
+
+class Histogram:
+    """
+    Thread-safe histogram over fixed upper bounds.
+
+    Buckets are cumulative, as in Prometheus: each reports how many
+    observations were less than or equal to its bound. The last bucket
+    (``le=None``) is +Inf.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self._bounds = sorted(buckets)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        buckets = []
+        cumulative = 0
+        for bound, count in zip([*self._bounds, None], counts, strict=True):
+            cumulative += count
+            buckets.append({"le": bound, "count": cumulative})
+        return {"buckets": buckets, "count": cumulative, "sum": total}
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, update
+from sqlmodel import col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.schemas import EmailOutbox
+from app.utils import send_email
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DEAD = "dead"
+
+
+class OutboxSender:
+    """
+    Delivers the email_outbox, a batch at a time.
+
+    A batch is claimed in one short transaction: its attempt counters are
+    bumped and its next attempt pushed out by the lease, so the messages
+    are not offered again while they are being sent, but are if this worker
+    dies first. Rows are picked with FOR UPDATE SKIP LOCKED, so every worker
+    can run a sender. Sending happens outside any transaction, at most
+    ``concurrency`` messages at a time.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        max_attempts: int,
+        backoff: float,
+        max_backoff: float,
+        lease: float,
+        concurrency: int,
+    ) -> None:
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.concurrency = concurrency
+        self.sent = 0
+        self.failed = 0
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        return timedelta(
+            seconds=min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        )
+
+    async def _claim(self) -> list[EmailOutbox]:
+        due = (
+            select(EmailOutbox.id)
+            .where(
+                col(EmailOutbox.status) == PENDING,
+                col(EmailOutbox.next_attempt_at) <= func.now(),
+            )
+            .order_by(col(EmailOutbox.next_attempt_at))
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(EmailOutbox)
+            .where(col(EmailOutbox.id).in_(due.scalar_subquery()))
+            .values(
+                attempts=EmailOutbox.attempts + 1,
+                next_attempt_at=func.now() + timedelta(seconds=self.lease),
+            )
+            .returning(EmailOutbox)
+            .execution_options(synchronize_session=False)
+        )
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            messages = list((await session.execute(statement)).scalars())
+            await session.commit()
+        return messages
+
+    async def _fail(self, message: EmailOutbox, error: Exception) -> None:
+        self.failed += 1
+        values: dict[str, Any] = {"last_error": str(error)}
+        if message.attempts >= self.max_attempts:
+            logger.error("Giving up on email %s: %s", message.id, error)
+            # Dead rows stay for inspection, but the body can carry secrets
+            # such as a new account's password
+            values["status"] = DEAD
+            values["html_content"] = ""
+        else:
+            values["next_attempt_at"] = func.now() + self.retry_delay(
+                message.attempts
+            )
+        statement = (
+            update(EmailOutbox)
+            .where(col(EmailOutbox.id) == message.id)
+            .values(**values)
+        )
+        async with AsyncSession(async_engine) as session:
+            await session.execute(statement)
+            await session.commit()
+
+    async def _send(self, message: EmailOutbox) -> bool:
+        try:
+            await run_in_threadpool(
+                send_email,
+                email_to=message.email_to,
+                subject=message.subject,
+                html_content=message.html_content,
+            )
+        except Exception as e:
+            await self._fail(message, e)
+            return False
+        return True
+
+    async def send_pending(self) -> int:
+        """
+        Send one batch of due messages. Returns the number sent.
+        """
+        messages = await self._claim()
+        # Each send holds a threadpool thread, which would otherwise sit
+        # blocked waiting for an SMTP connection; keep to the pool's size
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def send(message: EmailOutbox) -> bool:
+            async with slots:
+                return await self._send(message)
+
+        results = await asyncio.gather(*map(send, messages))
+        sent = [m.id for m, ok in zip(messages, results, strict=True) if ok]
+        if sent:
+            async with AsyncSession(async_engine) as session:
+                await session.execute(
+                    delete(EmailOutbox).where(col(EmailOutbox.id).in_(sent))
+                )
+                await session.commit()
+            self.sent += len(sent)
+        return len(sent)
+
+    async def stats(self) -> dict[str, int]:
+        statement = (
+            select(EmailOutbox.status, func.count())
+            .where(col(EmailOutbox.status).in_([PENDING, DEAD]))
+            .group_by(col(EmailOutbox.status))
+        )
+        async with AsyncSession(async_engine) as session:
+            counts = dict((await session.exec(statement)).all())
+        return {"pending": counts.get(PENDING, 0), "dead": counts.get(DEAD, 0)}
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                # Keep going while batches come back full
+                while await self.send_pending() >= self.batch_size:
+                    pass
+            except Exception as e:
+                logger.error("Email outbox delivery failed: %s", e)
+            await asyncio.sleep(interval)
+
+
+outbox_sender = OutboxSender(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    backoff=settings.EMAIL_OUTBOX_BACKOFF_SECONDS,
+    max_backoff=settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS,
+    lease=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    concurrency=settings.SMTP_POOL_SIZE,
+)
@@ -0,0 +1,32 @@
+import base64
+import json
+from collections.abc import Sequence
+from typing import Any
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Opaque cursor for the sort key of the last row of a page.
+
+    Values are stored as strings; the decoder's caller converts them back.
+    """
+    raw = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    """
+    Inverse of encode_cursor. Raises ValueError for anything it did not produce.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, str) for value in values)
+    ):
+        raise ValueError("Invalid cursor")
+    return values
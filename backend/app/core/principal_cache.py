@@ -0,0 +1,40 @@
+import uuid
+from typing import Any
+
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas import User
+
+# Column values of recently authenticated users, keyed by user id. Only this
+# process is invalidated on writes, so the TTL bounds how long another worker
+# can keep serving a stale principal.
+principal_cache: TTLCache[dict[str, Any]] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def get_cached_user(session: AsyncSession, user_id: str | uuid.UUID) -> User | None:
+    """
+    Return the cached user attached to ``session``, without querying.
+
+    The instance is made detached-as-if-loaded and added to the session, so
+    routes can update or delete it like a row they fetched themselves.
+    """
+    snapshot = principal_cache.get(str(user_id))
+    if snapshot is None:
+        return None
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    session.add(user)
+    return user
+
+
+def cache_user(user: User) -> None:
+    principal_cache.set(str(user.id), user.model_dump())
+
+
+def invalidate_user(user_id: str | uuid.UUID) -> None:
+    principal_cache.pop(str(user_id))
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, delete, exists
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.core.response_cache import USERS, invalidate_items, response_cache
+from app.core.suggestion_cache import invalidate_suggestions
+from app.schemas import Item, User
+
+logger = logging.getLogger(__name__)
+
+
+def _pending_user(user_id: uuid.UUID) -> tuple[ColumnElement[bool], ...]:
+    return col(User.id) == user_id, col(User.deletion_requested_at).is_not(None)
+
+
+def pending_user_items(user_id: uuid.UUID) -> ColumnElement[bool]:
+    """
+    The user's items, while their deletion is still pending. Each batch
+    re-checks it, so re-activating the user stops the purge.
+    """
+    return and_(col(Item.owner_id) == user_id, exists().where(*_pending_user(user_id)))
+
+
+def retention_items(cutoff: datetime) -> tuple[ColumnElement[bool], Any]:
+    """
+    The condition and order of the items created before ``cutoff``.
+    """
+    return col(Item.created_at) < cutoff, col(Item.created_at)
+
+
+@dataclass
+class PurgeProgress:
+    task: str
+    deleted: int = 0
+    batches: int = 0
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime | None = None
+    done: bool = False
+
+
+class PurgeEngine:
+    """
+    Deletes items matching a condition in bounded batches, each in its own
+    short transaction, sleeping between batches so purges never hold locks
+    for long or starve request traffic.
+
+    Batches take their rows with FOR UPDATE SKIP LOCKED, so several workers
+    can run the same purge without blocking each other. Progress of recent
+    purges is kept in memory for the progress endpoint.
+    """
+
+    def __init__(
+        self, batch_size: int, batch_delay: float, history_size: int = 100
+    ) -> None:
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.history_size = history_size
+        self._progress: OrderedDict[str, PurgeProgress] = OrderedDict()
+
+    def progress(self) -> list[dict[str, Any]]:
+        return [asdict(progress) for progress in self._progress.values()]
+
+    def _start(self, task: str) -> PurgeProgress:
+        progress = PurgeProgress(task=task)
+        self._progress.pop(task, None)
+        self._progress[task] = progress
+        while len(self._progress) > self.history_size:
+            self._progress.popitem(last=False)
+        return progress
+
+    def batch_statement(self, where: ColumnElement[bool], order_by: Any = None) -> Any:
+        """
+        DELETE of one batch of the items matching ``where``, returning their
+        owners.
+        """
+        batch = (
+            select(Item.id)
+            .where(where)
+            .order_by(order_by)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        return (
+            delete(Item)
+            .where(col(Item.id).in_(batch.scalar_subquery()))
+            .returning(Item.owner_id)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _delete_batch(
+        self, where: ColumnElement[bool], order_by: Any = None
+    ) -> int:
+        """
+        Delete one batch of items and invalidate the cached responses that
+        listed them. Returns the number of items deleted.
+        """
+        statement = self.batch_statement(where, order_by)
+        async with AsyncSession(async_engine) as session:
+            owner_ids = list((await session.execute(statement)).scalars())
+            await session.commit()
+        owners = set(owner_ids)
+        if owners:
+            invalidate_suggestions(*owners)
+            await invalidate_items(*owners)
+        return len(owner_ids)
+
+    async def purge_items(
+        self, task: str, where: ColumnElement[bool], order_by: Any = None
+    ) -> int:
+        """
+        Delete every item matching ``where``, a batch at a time. Returns the
+        number of items deleted.
+        """
+        progress = self._start(task)
+        while True:
+            deleted = await self._delete_batch(where, order_by)
+            progress.deleted += deleted
+            progress.batches += 1
+            progress.updated_at = datetime.now(timezone.utc)
+            if deleted < self.batch_size:
+                break
+            await asyncio.sleep(self.batch_delay)
+        progress.done = True
+        return progress.deleted
+
+    async def purge_user(self, user_id: uuid.UUID) -> None:
+        await self.purge_items(f"user:{user_id}", pending_user_items(user_id))
+        # Only the user row is left; the FK cascade has nothing to do
+        statement = delete(User).where(*_pending_user(user_id))
+        async with AsyncSession(async_engine) as session:
+            await session.execute(statement)
+            await session.commit()
+        await response_cache.invalidate(USERS)
+
+    async def purge_deleted_users(self) -> None:
+        statement = (
+            select(User.id)
+            .where(col(User.deletion_requested_at).is_not(None))
+            .order_by(col(User.deletion_requested_at))
+        )
+        async with AsyncSession(async_engine) as session:
+            user_ids = (await session.exec(statement)).all()
+        for user_id in user_ids:
+            await self.purge_user(user_id)
+
+    async def apply_retention(self) -> None:
+        if settings.ITEM_RETENTION_DAYS is None:
+            return
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.ITEM_RETENTION_DAYS)
+        await self.purge_items("retention", *retention_items(cutoff))
+
+    async def run_once(self) -> None:
+        await self.purge_deleted_users()
+        await self.apply_retention()
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error("Purge failed: %s", e)
+            await asyncio.sleep(interval)
+
+
+purge_engine = PurgeEngine(
+    batch_size=settings.PURGE_BATCH_SIZE, batch_delay=settings.PURGE_BATCH_DELAY_SECONDS
+)
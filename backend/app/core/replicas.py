@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import hmac
+import itertools
+import logging
+import math
+import time
+from collections.abc import Sequence
+from http.cookies import SimpleCookie
+from typing import Any
+
+from sqlalchemy import Delete, Engine, ExceptionContext, Insert, Update, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState
+from sqlmodel import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.db import make_async_engine
+
+logger = logging.getLogger(__name__)
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+# Signed time until which a client that wrote reads from the primary. It
+# travels with the client, so any worker or container honours it.
+STICKY_COOKIE = "primary_until"
+
+
+class ReplicaSet:
+    """
+    Round-robin over replica engines, skipping those that failed their last
+    health check or dropped a connection since.
+    """
+
+    def __init__(self, engines: Sequence[AsyncEngine]) -> None:
+        self.engines = list(engines)
+        self._healthy = dict.fromkeys(self.engines, True)
+        self._by_sync_engine = {engine.sync_engine: engine for engine in self.engines}
+        self._counter = itertools.count()
+        for engine in self.engines:
+            event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def choose(self) -> AsyncEngine | None:
+        healthy = [engine for engine in self.engines if self._healthy[engine]]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    def is_healthy(self, engine: AsyncEngine) -> bool:
+        return self._healthy[engine]
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        engine = self._by_sync_engine.get(context.engine)  # type: ignore[arg-type]
+        if engine is not None and context.is_disconnect:
+            self._mark(engine, healthy=False, reason=context.original_exception)
+
+    def _mark(self, engine: AsyncEngine, *, healthy: bool, reason: Any = None) -> None:
+        if self._healthy[engine] != healthy:
+            url = engine.url.render_as_string(hide_password=True)
+            if healthy:
+                logger.info("Replica %s is healthy again", url)
+            else:
+                logger.warning("Replica %s marked unhealthy: %s", url, reason)
+        self._healthy[engine] = healthy
+
+    async def check_health(self, timeout: float = 5.0) -> None:
+        for engine in self.engines:
+            try:
+                await asyncio.wait_for(_ping(engine), timeout)
+            except Exception as e:
+                self._mark(engine, healthy=False, reason=e)
+            else:
+                self._mark(engine, healthy=True)
+
+    async def run_health_checks(self, interval: float) -> None:
+        while True:
+            await self.check_health(timeout=interval)
+            await asyncio.sleep(interval)
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+async def _ping(engine: AsyncEngine) -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from ``info["replica"]`` when one was assigned.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary, and
+    once the session has written, its reads follow to the primary as well.
+    """
+
+    def get_bind(  # type: ignore[override]
+        self, mapper: Any = None, clause: Any = None, **kwargs: Any
+    ) -> Engine:
+        replica: AsyncEngine | None = self.info.get("replica")
+        if (
+            replica is not None
+            and not self._flushing
+            and not self.info.get("wrote")
+            and not isinstance(clause, Insert | Update | Delete)
+        ):
+            return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flag_write_on_flush(session: Session, _flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _flag_write_on_dml(orm_execute_state: ORMExecuteState) -> None:
+    # Statements that write from inside a CTE or raw SQL are not recognizable
+    # as DML and say so with the "writes" execution option
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+        or orm_execute_state.execution_options.get("writes")
+    ):
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(session: Session) -> None:
+    # PrimaryStickinessMiddleware answers with the sticky cookie
+    state = session.info.get("request_state")
+    if session.info.get("wrote") and state is not None:
+        state.wrote_to_primary = True
+
+
+def _sign(value: str) -> str:
+    key = settings.SECRET_KEY.encode()
+    return hmac.new(key, value.encode(), hashlib.sha256).hexdigest()
+
+
+def sticky_cookie(until: float) -> str:
+    value = f"{until:.3f}"
+    return f"{value}.{_sign(value)}"
+
+
+def sticks_to_primary(cookie: str | None) -> bool:
+    """
+    Whether ``cookie`` is a sticky cookie with a valid signature that has
+    not expired yet.
+    """
+    if not cookie:
+        return False
+    value, _, signature = cookie.rpartition(".")
+    if not hmac.compare_digest(signature, _sign(value)):
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def replica_for(method: str, sticky: bool) -> AsyncEngine | None:
+    """
+    Replica to read from for a request, or None to use the primary.
+    """
+    if method not in READ_ONLY_METHODS or sticky:
+        return None
+    return replica_set.choose()
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Sets the sticky cookie on responses to requests that committed a write,
+    while there are replicas to read from.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Shared with request.state, where _stick_to_primary flags the write
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and state.get("wrote_to_primary")
+                and replica_set.engines
+            ):
+                ttl = settings.REPLICA_STICKY_SECONDS
+                cookie: SimpleCookie = SimpleCookie()
+                cookie[STICKY_COOKIE] = sticky_cookie(time.time() + ttl)
+                cookie[STICKY_COOKIE]["max-age"] = math.ceil(ttl)
+                cookie[STICKY_COOKIE]["path"] = "/"
+                cookie[STICKY_COOKIE]["httponly"] = True
+                cookie[STICKY_COOKIE]["samesite"] = "lax"
+                if settings.ENVIRONMENT != "local":
+                    cookie[STICKY_COOKIE]["secure"] = True
+                headers = MutableHeaders(scope=message)
+                headers.append("set-cookie", cookie.output(header="").strip())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+replica_set = ReplicaSet(
+    [make_async_engine(uri) for uri in settings.SQLALCHEMY_REPLICA_ASYNC_URIS]
+)
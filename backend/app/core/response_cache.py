@@ -0,0 +1,185 @@
+import threading
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class ResponseCacheBackend(Protocol):
+    """
+    Storage for cached bodies and the generation counters that invalidate
+    them. Counters start at 0 and are never expired by the backend.
+    """
+
+    name: str
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def generation(self, scope: str) -> int: ...
+
+    async def bump(self, scope: str) -> None: ...
+
+
+class MemoryBackend:
+    """
+    Per-process LRU. Other workers would not see its invalidations, so it
+    is only for a single worker.
+    """
+
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries: TTLCache[bytes] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    async def generation(self, scope: str) -> int:
+        return self._generations.get(scope, 0)
+
+    async def bump(self, scope: str) -> None:
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SharedBackend:
+    """
+    A store shared by all workers, through an asyncio Redis-style client
+    (``get``, ``set(..., px=...)``, ``incr``). Invalidations are seen by
+    every worker at once.
+    """
+
+    name = "shared"
+
+    def __init__(self, client: Any, prefix: str = "response-cache:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        value: bytes | None = await self.client.get(self.prefix + key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def generation(self, scope: str) -> int:
+        value = await self.client.get(f"{self.prefix}gen:{scope}")
+        return int(value or 0)
+
+    async def bump(self, scope: str) -> None:
+        await self.client.incr(f"{self.prefix}gen:{scope}")
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+
+
+class ResponseCache:
+    """
+    Serialized list responses keyed by (user, route, query parameters).
+
+    Each entry also records the generation of the scope it was built from
+    (e.g. one owner's items); writes bump that generation, so the entries
+    they affect are never read again and age out of the backend.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend | None, ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def key(
+        self,
+        scope: str,
+        user_id: uuid.UUID,
+        route: str,
+        params: Iterable[tuple[str, str]],
+    ) -> str | None:
+        """
+        Cache key for a response, or None when caching is off. Take it before
+        querying and store under it afterwards: a write committed meanwhile
+        bumps the generation, so a stale body is stored under a dead key.
+        """
+        if self.backend is None:
+            return None
+        generation = await self.backend.generation(scope)
+        query = "&".join(f"{k}={v}" for k, v in sorted(params))
+        return f"{route}|{user_id}|{scope}@{generation}|{query}"
+
+    async def get(self, key: str | None) -> CachedResponse | None:
+        if self.backend is None or key is None:
+            return None
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, _, body = value.partition(b"\n")
+        return CachedResponse(body=body, etag=etag.decode())
+
+    async def set(self, key: str | None, response: CachedResponse) -> None:
+        if self.backend is None or key is None:
+            return
+        value = response.etag.encode() + b"\n" + response.body
+        await self.backend.set(key, value, self.ttl)
+
+    async def invalidate(self, *scopes: str) -> None:
+        if self.backend is None:
+            return
+        for scope in scopes:
+            await self.backend.bump(scope)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name if self.backend else "none",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Scopes: every item, one owner's items, and the user list
+ALL_ITEMS = "items"
+USERS = "users"
+
+
+def owner_items(owner_id: uuid.UUID) -> str:
+    return f"items:{owner_id}"
+
+
+def _make_backend() -> ResponseCacheBackend | None:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryBackend(
+            maxsize=settings.RESPONSE_CACHE_SIZE,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        # Optional dependency, only needed for the shared backend
+        import redis.asyncio
+
+        return SharedBackend(redis.asyncio.Redis.from_url(settings.RESPONSE_CACHE_URL))
+    return None
+
+
+response_cache = ResponseCache(_make_backend(), ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+async def invalidate_items(*owner_ids: uuid.UUID) -> None:
+    await response_cache.invalidate(ALL_ITEMS, *map(owner_items, owner_ids))
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import sys
+import time
+import uuid
+
+from sqlmodel import col, or_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.schemas import User
+
+logger = logging.getLogger(__name__)
+
+# Minimum version of an inactive user, which no token can carry
+REVOKED = sys.maxsize
+
+
+class RevocationList:
+    """
+    User id -> minimum token version still accepted.
+
+    Only users that ever had a token revoked (or are inactive) have an entry,
+    so the mapping stays small. It is rebuilt from the database periodically,
+    and updated immediately for revocations made by this process. Entries
+    of users that are no longer in the database are kept until any token
+    issued to them has expired.
+    """
+
+    def __init__(self) -> None:
+        self._min_version: dict[str, int] = {}
+        # When each entry was last confirmed by a revocation or a refresh
+        self._seen: dict[str, float] = {}
+
+    def is_revoked(self, user_id: str | uuid.UUID, version: int) -> bool:
+        return version < self._min_version.get(str(user_id), 0)
+
+    def revoke(self, user_id: str | uuid.UUID, min_version: int = REVOKED) -> None:
+        key = str(user_id)
+        self._min_version[key] = max(self._min_version.get(key, 0), min_version)
+        self._seen[key] = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._min_version)
+
+    async def refresh(self) -> None:
+        statement = select(User.id, User.is_active, User.token_version).where(
+            or_(col(User.is_active).is_(False), col(User.token_version) > 0)
+        )
+        async with AsyncSession(async_engine) as session:
+            rows = (await session.exec(statement)).all()
+        now = time.monotonic()
+        min_version = {
+            str(user_id): token_version if is_active else REVOKED
+            for user_id, is_active, token_version in rows
+        }
+        seen = dict.fromkeys(min_version, now)
+        # Token versions never go down, so a user missing from the query was
+        # deleted, and tokens issued before that are valid until they expire
+        expired = now - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        for key, version in self._min_version.items():
+            if key not in min_version and self._seen[key] > expired:
+                min_version[key] = version
+                seen[key] = self._seen[key]
+        self._min_version, self._seen = min_version, seen
+
+    async def run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Could not refresh the token revocation list: %s", e)
+
+
+revocation_list = RevocationList()
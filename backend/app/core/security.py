@@ -1,27 +1,159 @@
+import asyncio
+import hashlib
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from functools import cache
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import jwt
-from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import Histogram
+from app.schemas import TokenPayload
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
 
 ALGORITHM = "HS256"
 
+T = TypeVar("T")
 
-def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
+
+class PasswordHashQueueFull(Exception):
+    """The password hashing pool already has as much work queued as allowed."""
+
+
+def create_access_token(
+    subject: str | Any,
+    expires_delta: timedelta,
+    claims: dict[str, Any] | None = None,
+) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+# Verified access tokens by SHA-256 digest. Each entry expires with its
+# token, so a hit is exactly as valid as a fresh jwt.decode.
+_token_cache: TTLCache[TokenPayload] = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
+def decode_access_token(token: str) -> TokenPayload:
+    """
+    Verify ``token`` and return its payload.
+
+    Raises ``InvalidTokenError`` or ``ValidationError`` like ``jwt.decode``
+    followed by ``TokenPayload`` validation would.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    token_data = _token_cache.get(key)
+    if token_data is not None:
+        return token_data
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    token_data = TokenPayload(**payload)
+    ttl = None
+    if "exp" in payload:
+        ttl = float(payload["exp"]) - time.time()
+    if ttl is None or ttl > 0:
+        _token_cache.set(key, token_data, ttl=ttl)
+    return token_data
+
+
+def token_cache_stats() -> dict[str, int]:
+    return _token_cache.stats()
+
+
+@cache
+def _pwd_context() -> "CryptContext":
+    # passlib is only imported once a password is hashed or checked, which
+    # mostly happens in the hashing pool's processes
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
+
+
+# bcrypt holds the GIL for hundreds of milliseconds per call, so request
+# handlers run it in a dedicated process pool. The pool is created on first
+# use, which also keeps it out of the parent when the server forks workers.
+# Its processes come from a forkserver rather than a fork of the serving
+# worker, which by then has threads (whose locks a fork can leave held) and
+# pooled database connections.
+_hash_executor: ProcessPoolExecutor | None = None
+_hash_in_flight = 0
+_hash_rejected = 0
+_hash_latency = Histogram()
+
+
+def _warm_hash_worker() -> None:
+    # Load passlib and its bcrypt backend before the first request needs them
+    _pwd_context().handler("bcrypt").get_backend()
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=context,
+            initializer=_warm_hash_worker,
+        )
+    return _hash_executor
+
+
+async def _run_in_hash_pool(func: Callable[..., T], *args: Any) -> T:
+    global _hash_in_flight, _hash_rejected
+    if _hash_in_flight >= settings.PASSWORD_HASH_MAX_PENDING:
+        _hash_rejected += 1
+        raise PasswordHashQueueFull()
+    _hash_in_flight += 1
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_in_flight -= 1
+        _hash_latency.observe(time.perf_counter() - start)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
+def password_hash_pool_stats() -> dict[str, Any]:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "in_flight": _hash_in_flight,
+        "queued": max(_hash_in_flight - settings.PASSWORD_HASH_WORKERS, 0),
+        "rejected": _hash_rejected,
+        "latency": _hash_latency.snapshot(),
+    }
+
+
+def shutdown_password_hash_pool() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(cancel_futures=True)
+        _hash_executor = None
@@ -0,0 +1,161 @@
+import smtplib
+import ssl
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+
+@dataclass
+class _Connection:
+    smtp: smtplib.SMTP
+    messages: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SMTPPool:
+    """
+    Logged-in SMTP connections shared by the threads that send email.
+
+    A connection is reused until it has sent ``max_messages`` messages or sat
+    idle for ``idle_timeout`` seconds, so the connect, STARTTLS and AUTH round
+    trips are paid once per connection rather than once per message. At most
+    ``size`` connections are open at a time; further senders wait for one.
+
+    A pooled connection the server has since dropped fails on first use; the
+    message is then retried once on a fresh connection. A refused message
+    (an SMTP error reply) leaves the connection usable.
+    """
+
+    def __init__(self, size: int, idle_timeout: float, max_messages: int) -> None:
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.latency = Histogram()
+        self.connects = 0
+        self.reconnects = 0
+        self._idle: list[_Connection] = []
+        self._open = 0
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> _Connection:
+        assert settings.SMTP_HOST, "no provided configuration for email variables"
+        timeout = settings.SMTP_TIMEOUT_SECONDS
+        smtp: smtplib.SMTP
+        if settings.SMTP_SSL:
+            smtp = smtplib.SMTP_SSL(
+                settings.SMTP_HOST,
+                settings.SMTP_PORT,
+                timeout=timeout,
+                context=ssl.create_default_context(),
+            )
+        else:
+            smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=timeout)
+        try:
+            if settings.SMTP_TLS and not settings.SMTP_SSL:
+                smtp.starttls(context=ssl.create_default_context())
+            if settings.SMTP_USER:
+                smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD or "")
+        except BaseException:
+            smtp.close()
+            raise
+        with self._lock:
+            self.connects += 1
+            self._open += 1
+        return _Connection(smtp)
+
+    def _discard(self, connection: _Connection, quit: bool = False) -> None:
+        try:
+            if quit:
+                connection.smtp.quit()
+            else:
+                connection.smtp.close()
+        except (smtplib.SMTPException, OSError):
+            connection.smtp.close()
+        with self._lock:
+            self._open -= 1
+
+    def _checkout(self) -> _Connection | None:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection = self._idle.pop()
+            if now - connection.last_used <= self.idle_timeout:
+                return connection
+            self._discard(connection, quit=True)
+
+    def _checkin(self, connection: _Connection) -> None:
+        connection.last_used = time.monotonic()
+        if connection.messages >= self.max_messages:
+            self._discard(connection, quit=True)
+            return
+        with self._lock:
+            self._idle.append(connection)
+
+    def send(self, from_addr: str, to_addrs: list[str], message: str) -> None:
+        with self._slots:
+            start = time.perf_counter()
+            try:
+                self._send(from_addr, to_addrs, message)
+            finally:
+                self.latency.observe(time.perf_counter() - start)
+
+    def _send(self, from_addr: str, to_addrs: list[str], message: str) -> None:
+        connection = self._checkout()
+        reused = connection is not None
+        if connection is None:
+            connection = self._connect()
+        while True:
+            try:
+                connection.smtp.sendmail(from_addr, to_addrs, message)
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # The server refused this message; sendmail has already reset
+                # the session, so the connection can take the next one
+                connection.messages += 1
+                self._checkin(connection)
+                raise
+            except (smtplib.SMTPException, OSError):
+                self._discard(connection)
+                if not reused:
+                    raise
+                with self._lock:
+                    self.reconnects += 1
+                reused = False
+                connection = self._connect()
+                continue
+            except BaseException:
+                self._discard(connection)
+                raise
+            connection.messages += 1
+            self._checkin(connection)
+            return
+
+    def close(self) -> None:
+        while (connection := self._checkout()) is not None:
+            self._discard(connection, quit=True)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            idle = len(self._idle)
+            open_ = self._open
+        return {
+            "size": self.size,
+            "open": open_,
+            "idle": idle,
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "latency": self.latency.snapshot(),
+        }
+
+
+smtp_pool = SMTPPool(
+    size=settings.SMTP_POOL_SIZE,
+    idle_timeout=settings.SMTP_POOL_IDLE_TIMEOUT_SECONDS,
+    max_messages=settings.SMTP_POOL_MAX_MESSAGES,
+)
@@ -0,0 +1,36 @@
+import uuid
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Recent title suggestions, one small LRU of (prefix, limit) per user. Item
+# writes in this process drop the owner's entry; the TTL bounds staleness
+# from writes handled by other workers.
+_suggestion_caches: TTLCache[TTLCache[list[str]]] = TTLCache(
+    maxsize=settings.SUGGEST_CACHE_USERS, ttl=settings.SUGGEST_CACHE_TTL_SECONDS
+)
+
+
+def get_suggestions(user_id: uuid.UUID, prefix: str, limit: int) -> list[str] | None:
+    cache = _suggestion_caches.get(user_id)
+    if cache is None:
+        return None
+    return cache.get((prefix.lower(), limit))
+
+
+def cache_suggestions(
+    user_id: uuid.UUID, prefix: str, limit: int, titles: list[str]
+) -> None:
+    cache = _suggestion_caches.get(user_id)
+    if cache is None:
+        cache = TTLCache(
+            maxsize=settings.SUGGEST_CACHE_PREFIXES,
+            ttl=settings.SUGGEST_CACHE_TTL_SECONDS,
+        )
+        _suggestion_caches.set(user_id, cache)
+    cache.set((prefix.lower(), limit), titles)
+
+
+def invalidate_suggestions(*user_ids: uuid.UUID) -> None:
+    for user_id in user_ids:
+        _suggestion_caches.pop(user_id)
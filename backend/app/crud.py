@@ -1,10 +1,51 @@
 import uuid
 from typing import Any
 
-from sqlmodel import Session, select
+from sqlalchemy import (
+    Boolean,
+    Float,
+    String,
+    Uuid,
+    and_,
+    any_,
+    bindparam,
+    case,
+    column,
+    delete,
+    false,
+    insert,
+    or_,
+    true,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Session, col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
-from backend.app.schemas import Item, ItemCreate, User, UserCreate, UserUpdate
+from app.core.security import (
+    get_password_hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
+from app.schemas import (
+    ITEM_SEARCH,
+    CountMode,
+    EmailOutbox,
+    Item,
+    ItemCount,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemUpdate,
+    User,
+    UserCreate,
+    UserUpdate,
+    UserUpdateMe,
+)
+from app.utils import EmailData
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -19,18 +60,55 @@ def create_user(*, session: Session, user_create: UserCreate) -> User:
 
 def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     user_data = user_in.model_dump(exclude_unset=True)
-    extra_data = {}
     if "password" in user_data:
-        password = user_data["password"]
-        hashed_password = get_password_hash(password)
-        extra_data["hashed_password"] = hashed_password
-    db_user.sqlmodel_update(user_data, update=extra_data)
-    session.add(db_user)
+        user_data["hashed_password"] = get_password_hash(user_data.pop("password"))
+    db_user = session.execute(_update_user_statement(db_user.id, user_data)).one()[0]
     session.commit()
-    session.refresh(db_user)
     return db_user
 
 
+def _update_user_statement(user_id: uuid.UUID, user_data: dict[str, Any]) -> Any:
+    """
+    One UPDATE ... RETURNING for a user, bumping its version, and its
+    token_version when is_active or is_superuser change. The pre-update
+    values come from a FROM subquery, so the statement also returns whether
+    they changed. Rows are (User, privileges_changed). Activating a user
+    cancels their pending deletion.
+    """
+    if user_data.get("is_active"):
+        user_data = {**user_data, "deletion_requested_at": None}
+    old = (
+        select(User.id, User.is_active, User.is_superuser)
+        .where(User.id == user_id)
+        .subquery("old")
+    )
+    privileges_changed = or_(
+        false(),
+        *(
+            old.c[field].is_distinct_from(user_data[field])
+            for field in ("is_active", "is_superuser")
+            if field in user_data
+        ),
+    )
+    write = (
+        update(User)
+        .where(User.id == old.c.id)  # type: ignore[arg-type]
+        .values(
+            **user_data,
+            version=User.version + 1,
+            token_version=User.token_version + case((privileges_changed, 1), else_=0),
+        )
+        .returning(User, privileges_changed.label("privileges_changed"))
+    )
+    # ORM UPDATE ... RETURNING does not refresh a User already in the
+    # session (such as the current user); a select from the statement does
+    return (
+        select(User, column("privileges_changed", Boolean))
+        .from_statement(write)
+        .execution_options(populate_existing=True, writes=True)
+    )
+
+
 def get_user_by_email(*, session: Session, email: str) -> User | None:
     statement = select(User).where(User.email == email)
     session_user = session.exec(statement).first()
@@ -53,3 +131,362 @@ def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -
     session.refresh(db_item)
     return db_item
 
+
+# Async variants used by the API routes. Hashing is CPU bound, so it runs in
+# the password hashing process pool.
+
+
+async def create_user_async(*, session: AsyncSession, user_create: UserCreate) -> User:
+    hashed_password = await get_password_hash_async(user_create.password)
+    db_obj = User.model_validate(
+        user_create, update={"hashed_password": hashed_password}
+    )
+    session.add(db_obj)
+    await session.commit()
+    await session.refresh(db_obj)
+    return db_obj
+
+
+async def update_user_async(
+    *, session: AsyncSession, user_id: uuid.UUID, user_in: UserUpdate | UserUpdateMe
+) -> tuple[User, bool] | None:
+    """
+    Update a user in one round trip. Returns the updated user and whether
+    its privileges changed, or None if there is no such user. A taken email
+    raises IntegrityError. The caller commits.
+    """
+    user_data = user_in.model_dump(exclude_unset=True)
+    if "password" in user_data:
+        user_data["hashed_password"] = await get_password_hash_async(
+            user_data.pop("password")
+        )
+    statement = _update_user_statement(user_id, user_data)
+    row = (await session.execute(statement)).first()
+    if row is None:
+        return None
+    user, privileges_changed = row
+    return user, privileges_changed
+
+
+def enqueue_email(
+    *, session: Session | AsyncSession, email_to: str, email_data: EmailData
+) -> EmailOutbox:
+    """
+    Queue an email for app.core.outbox. It is only sent if the caller's
+    transaction commits.
+    """
+    message = EmailOutbox(
+        email_to=email_to,
+        subject=email_data.subject,
+        html_content=email_data.html_content,
+    )
+    session.add(message)
+    return message
+
+
+async def request_user_deletion_async(
+    *, session: AsyncSession, user_id: uuid.UUID
+) -> bool:
+    """
+    Deactivate a user and queue them for app.core.purge, which deletes
+    their items and then the user. Returns False if there is no such user.
+    The caller commits.
+    """
+    statement = (
+        update(User)
+        .where(User.id == user_id)  # type: ignore[arg-type]
+        .values(
+            is_active=False,
+            deletion_requested_at=func.coalesce(
+                User.deletion_requested_at, func.now()
+            ),
+            token_version=User.token_version + 1,
+            version=User.version + 1,
+        )
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    )
+    return (await session.execute(statement)).first() is not None
+
+
+async def get_user_by_email_async(*, session: AsyncSession, email: str) -> User | None:
+    statement = select(User).where(User.email == email)
+    session_user = (await session.exec(statement)).first()
+    return session_user
+
+
+async def authenticate_async(
+    *, session: AsyncSession, email: str, password: str
+) -> User | None:
+    db_user = await get_user_by_email_async(session=session, email=email)
+    if not db_user:
+        return None
+    if not await verify_password_async(password, db_user.hashed_password):
+        return None
+    return db_user
+
+
+# Single item writes in one round trip. The write is guarded by ownership in
+# SQL (owner_id None lets superusers touch any item) and joined against a
+# plain lookup of the id, so one result row tells apart a missing item
+# (no row), one the caller may not change (no written columns) and success.
+# Callers commit.
+
+
+def _guarded_item_write(item_id: uuid.UUID, write: Any) -> Any:
+    written = write.cte("written")
+    target = select(Item.id).where(Item.id == item_id).cte("target")
+    return (
+        select(target.c.id.label("target_id"), *written.c)
+        .select_from(target.outerjoin(written, true()))
+        .execution_options(writes=True)
+    )
+
+
+async def update_item_async(
+    *,
+    session: AsyncSession,
+    item_id: uuid.UUID,
+    item_in: ItemUpdate,
+    owner_id: uuid.UUID | None,
+) -> Any:
+    """
+    Returns None if the item does not exist, else a row whose ``id`` is None
+    when the caller does not own it, or holds the updated columns.
+    """
+    write = (
+        update(Item)
+        .where(Item.id == item_id)  # type: ignore[arg-type]
+        .values(**item_in.model_dump(exclude_unset=True), version=Item.version + 1)
+        .returning(*Item.__table__.c)  # type: ignore[attr-defined]
+    )
+    if owner_id is not None:
+        write = write.where(Item.owner_id == owner_id)  # type: ignore[arg-type]
+    return (await session.execute(_guarded_item_write(item_id, write))).first()
+
+
+async def delete_item_async(
+    *, session: AsyncSession, item_id: uuid.UUID, owner_id: uuid.UUID | None
+) -> Any:
+    """
+    Returns None if the item does not exist, else a row whose ``owner_id``
+    is None when the caller does not own it, or the deleted item's owner.
+    """
+    write = (
+        delete(Item)
+        .where(Item.id == item_id)  # type: ignore[arg-type]
+        .returning(Item.owner_id)
+    )
+    if owner_id is not None:
+        write = write.where(Item.owner_id == owner_id)  # type: ignore[arg-type]
+    return (await session.execute(_guarded_item_write(item_id, write))).first()
+
+
+# Bulk item writes: one statement per request whatever the number of rows.
+# owner_id restricts the rows touched to that owner's; None (superusers)
+# allows any row. Callers commit.
+
+
+async def create_items_async(
+    *, session: AsyncSession, items_in: list[ItemCreate], owner_id: uuid.UUID
+) -> list[Item]:
+    rows = [
+        Item.model_validate(item_in, update={"owner_id": owner_id}).model_dump()
+        for item_in in items_in
+    ]
+    statement = insert(Item).returning(Item, sort_by_parameter_order=True)
+    return list((await session.scalars(statement, rows)).all())
+
+
+async def update_items_async(
+    *,
+    session: AsyncSession,
+    items_in: list[ItemBulkUpdate],
+    owner_id: uuid.UUID | None,
+) -> list[Item]:
+    # Unset fields keep their value, so each row says which fields it sets
+    rows = values(
+        column("id", Uuid),
+        column("title", String),
+        column("description", String),
+        column("set_title", Boolean),
+        column("set_description", Boolean),
+        name="v",
+    ).data(
+        [
+            (
+                item_in.id,
+                item_in.title,
+                item_in.description,
+                "title" in item_in.model_fields_set,
+                "description" in item_in.model_fields_set,
+            )
+            for item_in in items_in
+        ]
+    )
+    statement = (
+        update(Item)
+        .where(Item.id == rows.c.id)  # type: ignore[arg-type]
+        .values(
+            title=case((rows.c.set_title, rows.c.title), else_=Item.title),
+            description=case(
+                (rows.c.set_description, rows.c.description), else_=Item.description
+            ),
+            version=Item.version + 1,
+        )
+        .returning(Item)
+        .execution_options(synchronize_session=False)
+    )
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)  # type: ignore[arg-type]
+    return list((await session.scalars(statement)).all())
+
+
+async def delete_items_async(
+    *, session: AsyncSession, ids: list[uuid.UUID], owner_id: uuid.UUID | None
+) -> dict[uuid.UUID, uuid.UUID]:
+    """
+    Returns the owner of each deleted item, by item id.
+    """
+    statement = (
+        delete(Item)
+        .where(Item.id == any_(bindparam("ids", ids, type_=ARRAY(Uuid))))  # type: ignore[arg-type]
+        .returning(Item.id, Item.owner_id)
+        .execution_options(synchronize_session=False)
+    )
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)  # type: ignore[arg-type]
+    return dict((await session.execute(statement)).tuples().all())
+
+
+async def existing_item_ids_async(
+    *, session: AsyncSession, ids: list[uuid.UUID]
+) -> set[uuid.UUID]:
+    statement = select(Item.id).where(
+        Item.id == any_(bindparam("ids", ids, type_=ARRAY(Uuid)))  # type: ignore[arg-type]
+    )
+    return set((await session.exec(statement)).all())
+
+
+# Listing totals. COUNT(*) reads every matching row, so listings ask for the
+# total they need: item totals come from the trigger-maintained item_count
+# table, table-wide estimates from the planner statistics in pg_class.
+
+
+async def estimate_row_count(*, session: AsyncSession, table: str) -> int | None:
+    statement = text(
+        "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+    )
+    estimate = (await session.execute(statement, {"table": table})).scalar()
+    # -1 (or 0 before PostgreSQL 14) until the table is first analyzed
+    if estimate is None or estimate <= 0:
+        return None
+    return int(estimate)
+
+
+async def count_items_async(
+    *, session: AsyncSession, owner_id: uuid.UUID | None, mode: CountMode
+) -> int | None:
+    if mode == "none":
+        return None
+    if owner_id is not None:
+        # A single primary key lookup, already exact
+        statement = select(ItemCount.count).where(ItemCount.owner_id == owner_id)
+        return (await session.exec(statement)).first() or 0
+    if mode == "estimated":
+        estimate = await estimate_row_count(session=session, table="item")
+        if estimate is not None:
+            return estimate
+    statement = select(func.coalesce(func.sum(ItemCount.count), 0))
+    return int((await session.exec(statement)).one())
+
+
+async def count_users_async(*, session: AsyncSession, mode: CountMode) -> int | None:
+    if mode == "none":
+        return None
+    if mode == "estimated":
+        estimate = await estimate_row_count(session=session, table="user")
+        if estimate is not None:
+            return estimate
+    statement = select(func.count()).select_from(User)
+    return (await session.exec(statement)).one()
+
+
+# Listing statements, shared by the routes and the query plan tests
+
+
+def items_page_statement(
+    *,
+    columns: list[Any],
+    owner_id: uuid.UUID | None,
+    after: tuple[uuid.UUID, uuid.UUID] | None,
+    skip: int,
+    limit: int,
+) -> Any:
+    """
+    A page of items ordered by (owner_id, id), all of them when ``owner_id``
+    is None. Keyset pagination after the (owner_id, id) of ``after`` when
+    given, ``skip`` rows otherwise.
+    """
+    statement = select(*columns).order_by(col(Item.owner_id), col(Item.id)).limit(limit)
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)
+    if after:
+        return statement.where(tuple_(Item.owner_id, Item.id) > after)
+    return statement.offset(skip)
+
+
+def search_items_statement(
+    *,
+    q: str,
+    owner_id: uuid.UUID | None,
+    after: tuple[float, uuid.UUID] | None,
+    limit: int,
+) -> Any:
+    """
+    Items matching the web search ``q``, best first, with their rank. Keyset
+    pagination after the (rank, id) of ``after`` when given.
+    """
+    query = func.websearch_to_tsquery("english", q)
+    rank_expr = func.ts_rank_cd(ITEM_SEARCH, query)
+    statement = select(Item, rank_expr).where(ITEM_SEARCH.op("@@")(query))
+    if owner_id is not None:
+        statement = statement.where(Item.owner_id == owner_id)
+    if after:
+        last_rank = bindparam("last_rank", after[0], type_=Float)
+        statement = statement.where(
+            or_(
+                rank_expr < last_rank,
+                and_(rank_expr == last_rank, col(Item.id) > after[1]),
+            )
+        )
+    return statement.order_by(rank_expr.desc(), col(Item.id)).limit(limit)
+
+
+def suggest_items_statement(*, owner_id: uuid.UUID, prefix: str, limit: int) -> Any:
+    """
+    Distinct titles of the owner's items starting with ``prefix``, ignoring
+    case.
+    """
+    pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return (
+        select(Item.title)
+        .where(Item.owner_id == owner_id)
+        .where(col(Item.title).ilike(f"{pattern}%", escape="\\"))
+        .distinct()
+        .order_by(col(Item.title))
+        .limit(limit)
+    )
+
+
+def users_page_statement(
+    *, columns: list[Any], after: str | None, skip: int, limit: int
+) -> Any:
+    """
+    A page of users ordered by email, after the email ``after`` when given,
+    ``skip`` rows otherwise.
+    """
+    statement = select(*columns).order_by(col(User.email)).limit(limit)
+    if after is not None:
+        return statement.where(col(User.email) > after)
+    return statement.offset(skip)
@@ -1,10 +1,10 @@
-import os
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = os.getenv("TEST_DATABASE_URL") if os.getenv("TESTING") else os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
+# Share the pool of app.core.db instead of opening a second one against the
+# same database.
+from app.core.db import engine
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
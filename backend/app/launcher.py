@@ -0,0 +1,295 @@
+"""
+Pre-forking server: one supervisor process, several uvicorn workers.
+
+The supervisor imports app.main once and binds the listening socket, then
+forks the workers, so the imported code and other read-only state are
+shared copy-on-write. Workers that exit (after WORKER_MAX_REQUESTS, past
+WORKER_MAX_RSS_MB, or on a crash) are replaced. Workers that fail to boot
+are respawned with an exponential backoff, and after
+WORKER_MAX_BOOT_FAILURES of them in a row the launcher gives up and exits
+with WORKER_BOOT_ERROR. SIGTERM or SIGINT stops the workers gracefully,
+SIGHUP replaces them one at a time.
+
+    python -m app.launcher
+"""
+
+import gc
+import logging
+import math
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+import uvicorn
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# How often the supervisor reaps workers, and workers check their memory
+CHECK_INTERVAL = 1.0
+
+SIGNALS = (signal.SIGTERM, signal.SIGINT, signal.SIGHUP)
+
+# Exit status of a worker that never started serving, and of the launcher
+# once it gives up on them (the same as gunicorn's)
+WORKER_BOOT_ERROR = 3
+# A worker that exits non-zero this soon after being spawned failed to boot
+BOOT_WINDOW = 10.0
+MAX_RESPAWN_DELAY = 30.0
+
+
+def cgroup_cpu_limit(cpu_max: Path = Path("/sys/fs/cgroup/cpu.max")) -> int | None:
+    # cgroup v2 quota, e.g. "200000 100000" for two CPUs or "max 100000"
+    try:
+        quota, period = cpu_max.read_text().split()
+    except (OSError, ValueError):
+        return None
+    if quota == "max":
+        return None
+    return max(math.ceil(int(quota) / int(period)), 1)
+
+
+def worker_count() -> int:
+    if settings.WEB_CONCURRENCY:
+        return settings.WEB_CONCURRENCY
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit else cpus
+
+
+def rss_bytes() -> int:
+    try:
+        resident = int(Path("/proc/self/statm").read_text().split()[1])
+        return resident * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # Peak rather than current RSS, in KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class WorkerServer(uvicorn.Server):
+    """
+    uvicorn server that also exits once its RSS passes ``max_rss`` bytes.
+    uvicorn itself handles ``limit_max_requests``.
+    """
+
+    def __init__(self, config: uvicorn.Config, max_rss: int | None) -> None:
+        super().__init__(config)
+        self.max_rss = max_rss
+
+    async def on_tick(self, counter: int) -> bool:
+        if await super().on_tick(counter):
+            return True
+        # Ticks are 0.1s apart
+        if self.max_rss and counter % int(CHECK_INTERVAL * 10) == 0:
+            rss = rss_bytes()
+            if rss > self.max_rss:
+                logger.info(
+                    "Worker %s using %d MiB, recycling", os.getpid(), rss >> 20
+                )
+                return True
+        return False
+
+
+def _dispose_engines_after_fork() -> None:
+    # Pooled connections belong to the parent; close=False drops them from
+    # this process's pools without touching the sockets the parent may use
+    from app.core.db import async_engine, engine
+    from app.core.replicas import replica_set
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for replica in replica_set.engines:
+        replica.sync_engine.dispose(close=False)
+
+
+def _run_worker(app: Any, sock: socket.socket) -> int:
+    # uvicorn handles SIGTERM and SIGINT; SIGHUP is for the supervisor, even
+    # when it is sent to the whole process group
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, SIGNALS)
+    _dispose_engines_after_fork()
+    limit_max_requests = None
+    if settings.WORKER_MAX_REQUESTS:
+        limit_max_requests = settings.WORKER_MAX_REQUESTS + random.randint(
+            0, settings.WORKER_MAX_REQUESTS_JITTER
+        )
+    config = uvicorn.Config(
+        app,
+        limit_max_requests=limit_max_requests,
+        timeout_graceful_shutdown=int(settings.WORKER_GRACEFUL_TIMEOUT_SECONDS),
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+    )
+    max_rss = settings.WORKER_MAX_RSS_MB
+    server = WorkerServer(config, max_rss=max_rss << 20 if max_rss else None)
+    server.run(sockets=[sock])
+    return 0 if server.started else WORKER_BOOT_ERROR
+
+
+class Supervisor:
+    def __init__(self, app: Any, sock: socket.socket, workers: int) -> None:
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        # Worker pids, with the time they were spawned
+        self.pids: dict[int, float] = {}
+        self.stopping = False
+        self.replace: list[int] = []
+        self.retiring: int | None = None
+        self.boot_failures = 0
+        self.respawn_at = 0.0
+
+    def spawn(self) -> None:
+        # Signals stay blocked across the fork, so a worker never runs the
+        # supervisor's handlers before installing its own
+        signal.pthread_sigmask(signal.SIG_BLOCK, SIGNALS)
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = _run_worker(self.app, self.sock)
+            except BaseException:
+                logger.exception("Worker %s failed", os.getpid())
+            finally:
+                # Skip the supervisor's atexit handlers and buffered state
+                os._exit(code)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, SIGNALS)
+        self.pids[pid] = time.monotonic()
+        logger.info("Started worker %s", pid)
+
+    def _stop(self, signum: int, _frame: FrameType | None) -> None:
+        logger.info("Received %s, stopping workers", signal.Signals(signum).name)
+        self._stop_workers()
+
+    def _stop_workers(self) -> None:
+        self.stopping = True
+        for pid in self.pids:
+            self._kill(pid, signal.SIGTERM)
+
+    def _reload(self, _signum: int, _frame: FrameType | None) -> None:
+        self.replace = list(self.pids)
+
+    def _kill(self, pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> list[int]:
+        exited = []
+        while self.pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            spawned_at = self.pids.pop(pid, None)
+            exited.append(pid)
+            if self.stopping or spawned_at is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            logger.info("Worker %s exited with %s", pid, code)
+            lifetime = time.monotonic() - spawned_at
+            if code == WORKER_BOOT_ERROR or (code != 0 and lifetime < BOOT_WINDOW):
+                self.boot_failures += 1
+                delay = CHECK_INTERVAL * 2 ** (self.boot_failures - 1)
+                self.respawn_at = time.monotonic() + min(delay, MAX_RESPAWN_DELAY)
+            else:
+                self.boot_failures = 0
+        return exited
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGHUP, self._reload)
+        # Keep the preloaded objects out of the collector's generations, so
+        # collections in workers do not write to (and copy) the shared pages
+        gc.freeze()
+        for _ in range(self.workers):
+            self.spawn()
+        code = 0
+        while not self.stopping:
+            self._reap()
+            if self.boot_failures >= settings.WORKER_MAX_BOOT_FAILURES:
+                logger.error(
+                    "%d workers in a row failed to boot, stopping", self.boot_failures
+                )
+                self._stop_workers()
+                code = WORKER_BOOT_ERROR
+                break
+            # Rolling restart: the next worker is stopped once the previous
+            # one has exited and been replaced
+            retired = self.retiring not in self.pids
+            if self.replace and retired and len(self.pids) == self.workers:
+                self.retiring = self.replace.pop()
+                self._kill(self.retiring, signal.SIGTERM)
+            while (
+                not self.stopping
+                and len(self.pids) < self.workers
+                and time.monotonic() >= self.respawn_at
+            ):
+                self.spawn()
+            time.sleep(CHECK_INTERVAL)
+        deadline = time.monotonic() + settings.WORKER_GRACEFUL_TIMEOUT_SECONDS
+        while self.pids and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in self.pids:
+            logger.warning("Worker %s did not stop in time, killing it", pid)
+            self._kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        return code
+
+
+def bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def main() -> None:
+    workers = worker_count()
+    if workers > 1 and settings.RESPONSE_CACHE_BACKEND == "memory":
+        sys.exit(
+            "RESPONSE_CACHE_BACKEND=memory only invalidates its own worker's "
+            "entries; use redis or none with more than one worker"
+        )
+    # Preload: everything imported here is shared by the workers
+    from app.main import app
+
+    sock = bind(settings.SERVER_HOST, settings.SERVER_PORT)
+    logger.info(
+        "Listening on %s:%s with %d workers",
+        settings.SERVER_HOST,
+        settings.SERVER_PORT,
+        workers,
+    )
+    try:
+        sys.exit(Supervisor(app, sock, workers).run())
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,88 @@
-import sentry_sdk
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
-from app.api.api_v1.api import api_router
+from app.api.main import api_router
 from app.core.config import settings
-from app.auth import router as auth_router  # Import the new auth router
+from app.core.db import async_engine
+from app.core.outbox import outbox_sender
+from app.core.purge import purge_engine
+from app.core.replicas import PrimaryStickinessMiddleware, replica_set
+from app.core.revocation import revocation_list
+from app.core.security import PasswordHashQueueFull, shutdown_password_hash_pool
+from app.core.smtp import smtp_pool
+from app.utils import precompile_email_templates
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
+    import sentry_sdk
+
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    precompile_email_templates()
+    background_tasks = []
+    if replica_set.engines:
+        background_tasks.append(
+            asyncio.create_task(
+                replica_set.run_health_checks(settings.REPLICA_HEALTH_CHECK_INTERVAL)
+            )
+        )
+    if settings.ACCESS_TOKEN_CLAIMS:
+        # Revocations must be known before claims are trusted
+        await revocation_list.refresh()
+        background_tasks.append(
+            asyncio.create_task(
+                revocation_list.run(settings.TOKEN_REVOCATION_REFRESH_SECONDS)
+            )
+        )
+    background_tasks.append(
+        asyncio.create_task(purge_engine.run(settings.PURGE_INTERVAL_SECONDS))
+    )
+    if settings.emails_enabled:
+        background_tasks.append(
+            asyncio.create_task(outbox_sender.run(settings.EMAIL_OUTBOX_POLL_SECONDS))
+        )
+    yield
+    for task in background_tasks:
+        task.cancel()
+    # asyncpg connections are bound to the event loop that opened them
+    await async_engine.dispose()
+    await replica_set.dispose()
+    shutdown_password_hash_pool()
+    await run_in_threadpool(smtp_pool.close)
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
+@app.exception_handler(PasswordHashQueueFull)
+async def password_hash_queue_full_handler(
+    _request: Request, _exc: PasswordHashQueueFull
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many concurrent password checks, try again"},
+        headers={"Retry-After": "1"},
+    )
+
+
+app.add_middleware(PrimaryStickinessMiddleware)
+
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
@@ -29,8 +93,5 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
-# Include the authentication routes
-app.include_router(auth_router, prefix="/auth", tags=["auth"])
-
 # Include the main API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,6 +1,11 @@
 import uuid
+from datetime import datetime, timezone
+from typing import Any, Literal
 
 from pydantic import EmailStr
+from sqlalchemy import BigInteger, DateTime, Index, Text, event, literal_column, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -41,8 +46,34 @@ class UpdatePassword(SQLModel):
 
 # Database model, database table inferred from class name
 class User(UserBase, table=True):
+    # Serves the revocation list refresh, which only wants revoked users, and
+    # the purge worker looking for users pending deletion
+    __table_args__ = (
+        Index(
+            "ix_user_revoked",
+            "id",
+            postgresql_where=text("is_active IS false OR token_version > 0"),
+        ),
+        Index(
+            "ix_user_deletion_requested_at",
+            "deletion_requested_at",
+            postgresql_where=text("deletion_requested_at IS NOT NULL"),
+        ),
+    )
+    # Read version back with RETURNING, as _bump_versions sets it in SQL
+    __mapper_args__ = {"eager_defaults": True}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
+    # Bumped to revoke claims-carrying access tokens issued before the change
+    token_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Row version behind ETags, bumped on every change (see _bump_versions)
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    # Set when deletion is requested; app.core.purge removes the user and
+    # their items in the background
+    deletion_requested_at: datetime | None = Field(
+        default=None, sa_type=DateTime(timezone=True)
+    )
     items: list["Item"] = Relationship(back_populates="owner", cascade_delete=True)
 
 
@@ -53,7 +84,8 @@ class UserPublic(UserBase):
 
 class UsersPublic(SQLModel):
     data: list[UserPublic]
-    count: int
+    count: int | None
+    next_cursor: str | None = None
 
 
 # Shared properties
@@ -74,13 +106,92 @@ class ItemUpdate(ItemBase):
 
 # Database model, database table inferred from class name
 class Item(ItemBase, table=True):
+    # Serves owner filters and the (owner_id, id) keyset order of listings,
+    # and age-based retention
+    __table_args__ = (
+        Index("ix_item_owner_id_id", "owner_id", "id"),
+        Index("ix_item_created_at", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
     )
+    # Row version behind ETags, bumped on every change (see _bump_versions)
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": text("now()")},
+    )
     owner: User | None = Relationship(back_populates="items")
 
 
+@event.listens_for(Session, "before_flush")
+def _bump_versions(session: Session, *_: Any) -> None:
+    # Covers every ORM write path, sync and async; statements that update
+    # rows directly bump version themselves. The increment is done in SQL,
+    # so an instance loaded before someone else's change (or a detached one,
+    # such as a cached principal) cannot write back an old version + 1.
+    for obj in session.dirty:
+        if isinstance(obj, User | Item) and session.is_modified(
+            obj, include_collections=False
+        ):
+            obj.version = type(obj).version + 1
+
+
+# Generated tsvector over title (weight A) and description (weight B), with a
+# GIN index on (owner_id, search); see the d7f3b1a6c940 migration. It is left
+# off the model so inserts and dumps never carry it.
+ITEM_SEARCH = literal_column("item.search", TSVECTOR)
+
+
+# Per-owner item totals, kept current by triggers on item (see the
+# 7a9e5c2d1f83 migration); never written by the application
+class ItemCount(SQLModel, table=True):
+    __tablename__ = "item_count"
+
+    owner_id: uuid.UUID = Field(primary_key=True)
+    count: int = Field(
+        default=0, sa_type=BigInteger, sa_column_kwargs={"server_default": "0"}
+    )
+
+
+# Emails written in the same transaction as the change that triggers them and
+# delivered by app.core.outbox. Sent rows are deleted; rows that run out of
+# attempts stay behind as "dead" for inspection.
+class EmailOutbox(SQLModel, table=True):
+    __tablename__ = "email_outbox"
+    # Serves the sender's scan for due messages
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    email_to: str = Field(max_length=255)
+    subject: str = Field(max_length=255)
+    html_content: str = Field(sa_type=Text)
+    status: str = Field(
+        default="pending", max_length=16, sa_column_kwargs={"server_default": "pending"}
+    )
+    attempts: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    next_attempt_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": text("now()")},
+    )
+    last_error: str | None = Field(default=None, sa_type=Text)
+
+
+# How listings compute their total: exact, planner estimate or not at all
+CountMode = Literal["exact", "estimated", "none"]
+
+
 # Properties to return via API, id is always required
 class ItemPublic(ItemBase):
     id: uuid.UUID
@@ -89,7 +200,40 @@ class ItemPublic(ItemBase):
 
 class ItemsPublic(SQLModel):
     data: list[ItemPublic]
-    count: int
+    count: int | None
+    next_cursor: str | None = None
+
+
+class ItemSuggestions(SQLModel):
+    data: list[str]
+
+
+# Properties to receive per item on bulk update
+class ItemBulkUpdate(ItemUpdate):
+    id: uuid.UUID
+
+
+# Outcome of one row of a bulk request, in request order
+class ItemBulkResult(SQLModel):
+    id: uuid.UUID
+    status: Literal["created", "updated", "deleted", "not_found", "forbidden"]
+    item: ItemPublic | None = None
+
+
+class ItemBulkResults(SQLModel):
+    data: list[ItemBulkResult]
+
+
+class ItemImportError(SQLModel):
+    line: int
+    error: str
+
+
+class ItemImportResult(SQLModel):
+    imported: int
+    error_count: int
+    # The first IMPORT_MAX_ERRORS of them
+    errors: list[ItemImportError]
 
 
 # Generic message
@@ -106,8 +250,79 @@ class Token(SQLModel):
 # Contents of JWT token
 class TokenPayload(SQLModel):
     sub: str | None = None
+    # Only present when ACCESS_TOKEN_CLAIMS is enabled
+    is_active: bool | None = None
+    is_superuser: bool | None = None
+    ver: int | None = None
 
 
 class NewPassword(SQLModel):
     token: str
     new_password: str = Field(min_length=8, max_length=40)
+
+
+class HistogramBucket(SQLModel):
+    le: float | None  # None is +Inf
+    count: int
+
+
+class LatencyHistogram(SQLModel):
+    buckets: list[HistogramBucket]
+    count: int
+    sum: float
+
+
+class DBPoolStatus(SQLModel):
+    name: str
+    healthy: bool = True
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkout_wait: LatencyHistogram
+
+
+class CacheStats(SQLModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+
+
+class ResponseCacheStats(SQLModel):
+    backend: str
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class EmailOutboxStats(SQLModel):
+    pending: int
+    dead: int
+
+
+class SMTPPoolStats(SQLModel):
+    size: int
+    open: int
+    idle: int
+    connects: int
+    reconnects: int
+    latency: LatencyHistogram
+
+
+class PurgeProgress(SQLModel):
+    task: str
+    deleted: int
+    batches: int
+    started_at: datetime
+    updated_at: datetime | None
+    done: bool
+
+
+class PasswordHashPoolStats(SQLModel):
+    workers: int
+    max_pending: int
+    in_flight: int
+    queued: int
+    rejected: int
+    latency: LatencyHistogram
@@ -0,0 +1,159 @@
+"""
+Export items through a real server process and check that the server's
+resident memory stays under a fixed ceiling while it streams.
+
+The default run exports a small table. The million-row check seeds for a
+while and only runs with EXPORT_TEST_LARGE=1; EXPORT_TEST_ROWS and
+EXPORT_TEST_RSS_GROWTH_MB change its row count and allowed RSS growth.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, delete
+
+from app import crud
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.schemas import Item, User, UserCreate
+from app.tests.utils.utils import random_email, random_lower_string
+
+SMALL_ROWS = 20_000
+LARGE_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", 1_000_000))
+RSS_GROWTH_MB = int(os.environ.get("EXPORT_TEST_RSS_GROWTH_MB", 64))
+
+pytestmark = pytest.mark.skipif(
+    not Path("/proc/self/status").exists(), reason="reads RSS from /proc"
+)
+
+
+def _rss_mb(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    raise RuntimeError("VmRSS not found")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+@contextmanager
+def _exporter(db: Session, rows: int) -> Iterator[User]:
+    user = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO item (id, title, description, owner_id)
+            SELECT gen_random_uuid(), 'item ' || n, repeat('x', 64), :owner_id
+            FROM generate_series(1, :rows) AS n
+            """
+        ),
+        {"owner_id": user.id, "rows": rows},
+    )
+    db.commit()
+    try:
+        yield user
+    finally:
+        db.execute(delete(Item).where(Item.owner_id == user.id))  # type: ignore[arg-type]
+        db.delete(user)
+        db.commit()
+
+
+@pytest.fixture(scope="module")
+def server() -> Generator[tuple[str, subprocess.Popen[bytes]], None, None]:
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)]
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}{settings.API_V1_STR}/utils/health-check/")
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise
+                time.sleep(0.2)
+        yield base_url, process
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def _export(
+    base_url: str, process: subprocess.Popen[bytes], user: User
+) -> tuple[int, list[str], float]:
+    """
+    Export ``user``'s items as NDJSON. Returns the number of lines, the
+    first few of them, and how many MB the server's RSS grew meanwhile.
+    """
+    token = create_access_token(user.id, timedelta(minutes=30))
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{base_url}{settings.API_V1_STR}/items/export"
+
+    # Warm up the pools and caches on a small request before the baseline
+    r = httpx.get(
+        f"{base_url}{settings.API_V1_STR}/items/", headers=headers, params={"limit": 1}
+    )
+    assert r.status_code == 200
+    baseline = peak = _rss_mb(process.pid)
+
+    lines: list[str] = []
+    rows = 0
+    with httpx.stream("GET", url, headers=headers, timeout=None) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"] == "application/x-ndjson"
+        for line in r.iter_lines():
+            rows += 1
+            if rows <= 10:
+                lines.append(line)
+            if rows % 10_000 == 0:
+                peak = max(peak, _rss_mb(process.pid))
+    return rows, lines, peak - baseline
+
+
+def test_export_items_stream(
+    db: Session, server: tuple[str, subprocess.Popen[bytes]]
+) -> None:
+    with _exporter(db, SMALL_ROWS) as user:
+        rows, lines, growth = _export(*server, user)
+    assert rows == SMALL_ROWS
+    for line in lines:
+        item = json.loads(line)
+        assert set(item) == {"id", "title", "description", "owner_id"}
+        assert item["owner_id"] == str(user.id)
+        assert item["description"] == "x" * 64
+    assert growth < RSS_GROWTH_MB, f"server RSS grew {growth:.1f} MB"
+
+
+@pytest.mark.skipif(
+    not os.environ.get("EXPORT_TEST_LARGE"), reason="set EXPORT_TEST_LARGE=1"
+)
+def test_export_million_items_memory_is_flat(
+    db: Session, server: tuple[str, subprocess.Popen[bytes]]
+) -> None:
+    with _exporter(db, LARGE_ROWS) as user:
+        rows, _, growth = _export(*server, user)
+    assert rows == LARGE_ROWS
+    assert growth < RSS_GROWTH_MB, (
+        f"server RSS grew {growth:.1f} MB exporting {LARGE_ROWS} rows"
+    )
@@ -1,10 +1,20 @@
+import csv
+import io
+import json
 import uuid
+from collections.abc import Iterator
+from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
+from app import crud
 from app.core.config import settings
+from app.core.response_cache import response_cache
+from app.schemas import ItemCreate, UserCreate
 from app.tests.utils.item import create_random_item
+from app.tests.utils.user import user_authentication_headers
+from app.tests.utils.utils import count_statements, random_email, random_lower_string
 
 
 def test_create_item(
@@ -162,3 +172,483 @@ def test_delete_item_not_enough_permissions(
     assert response.status_code == 400
     content = response.json()
     assert content["detail"] == "Not enough permissions"
+
+
+def test_read_items_cursor_pagination(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    created = {
+        crud.create_item(
+            session=db,
+            item_in=ItemCreate(title=random_lower_string()),
+            owner_id=user.id,
+        ).id
+        for _ in range(5)
+    }
+    headers = user_authentication_headers(client=client, email=email, password=password)
+
+    seen: list[str] = []
+    params: dict[str, str | int] = {"limit": 2}
+    while True:
+        r = client.get(f"{settings.API_V1_STR}/items/", headers=headers, params=params)
+        assert r.status_code == 200
+        content = r.json()
+        assert content["count"] == 5
+        seen += [item["id"] for item in content["data"]]
+        if not content["next_cursor"]:
+            break
+        params = {"limit": 2, "cursor": content["next_cursor"]}
+
+    assert seen == sorted(seen, key=uuid.UUID)
+    assert {uuid.UUID(id) for id in seen} == created
+
+
+def test_read_items_invalid_cursor(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=normal_user_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+
+def test_read_items_count_modes(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    for _ in range(3):
+        crud.create_item(
+            session=db, item_in=ItemCreate(title=random_lower_string()), owner_id=user.id
+        )
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    url = f"{settings.API_V1_STR}/items/"
+
+    r = client.get(url, headers=headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 3
+
+    r = client.delete(f"{url}{content['data'][0]['id']}", headers=headers)
+    assert r.status_code == 200
+    # The trigger-maintained counter follows deletes too
+    r = client.get(url, headers=headers, params={"count": "estimated"})
+    assert r.json()["count"] == 2
+
+    r = client.get(url, headers=headers, params={"count": "none"})
+    assert r.status_code == 200
+    assert r.json()["count"] is None
+    assert len(r.json()["data"]) == 2
+
+    r = client.get(url, headers=headers, params={"count": "bogus"})
+    assert r.status_code == 422
+
+
+def test_export_items(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    created = {
+        str(
+            crud.create_item(
+                session=db,
+                item_in=ItemCreate(title=random_lower_string()),
+                owner_id=user.id,
+            ).id
+        )
+        for _ in range(3)
+    }
+    create_random_item(db)
+    headers = user_authentication_headers(client=client, email=email, password=password)
+
+    r = client.get(f"{settings.API_V1_STR}/items/export", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert {row["id"] for row in rows} == created
+    assert all(row["owner_id"] == str(user.id) for row in rows)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/items/export", headers=headers, params={"format": "csv"}
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert {row["id"] for row in rows} == created
+
+
+def test_bulk_create_update_delete_items(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    url = f"{settings.API_V1_STR}/items/bulk"
+    others = create_random_item(db)
+    missing = uuid.uuid4()
+
+    r = client.post(
+        url,
+        headers=headers,
+        json=[{"title": "one"}, {"title": "two", "description": "2"}, {"title": "three"}],
+    )
+    assert r.status_code == 200
+    created = r.json()["data"]
+    assert [row["status"] for row in created] == ["created"] * 3
+    assert [row["item"]["title"] for row in created] == ["one", "two", "three"]
+    ids = [row["id"] for row in created]
+
+    r = client.patch(
+        url,
+        headers=headers,
+        json=[
+            {"id": ids[1], "description": None},
+            {"id": str(others.id), "title": "stolen"},
+            {"id": str(missing), "title": "ghost"},
+            {"id": ids[0], "title": "uno"},
+        ],
+    )
+    assert r.status_code == 200
+    results = r.json()["data"]
+    assert [row["status"] for row in results] == [
+        "updated",
+        "forbidden",
+        "not_found",
+        "updated",
+    ]
+    assert results[0]["item"] == {
+        "id": ids[1],
+        "title": "two",
+        "description": None,
+        "owner_id": created[1]["item"]["owner_id"],
+    }
+    assert results[3]["item"]["title"] == "uno"
+    db.refresh(others)
+    assert others.title != "stolen"
+
+    r = client.request(
+        "DELETE", url, headers=headers, json=[ids[0], str(others.id), str(missing)]
+    )
+    assert r.status_code == 200
+    assert [row["status"] for row in r.json()["data"]] == [
+        "deleted",
+        "forbidden",
+        "not_found",
+    ]
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+    assert {item["id"] for item in r.json()["data"]} == {ids[1], ids[2]}
+
+
+def test_bulk_items_limits(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/items/bulk"
+    with patch("app.core.config.settings.ITEMS_BULK_MAX", 2):
+        r = client.post(
+            url, headers=normal_user_token_headers, json=[{"title": "x"}] * 3
+        )
+    assert r.status_code == 400
+
+    id = str(uuid.uuid4())
+    r = client.request(
+        "DELETE", url, headers=normal_user_token_headers, json=[id, id]
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Duplicate item ids"
+
+
+def test_import_items(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    url = f"{settings.API_V1_STR}/items/import"
+
+    ndjson = "\n".join(
+        [
+            json.dumps({"title": "first", "description": "one"}),
+            "{not json",
+            json.dumps({"title": ""}),
+            "",
+            json.dumps({"title": "second"}),
+        ]
+    )
+    r = client.post(url, headers=headers, content=ndjson.encode())
+    assert r.status_code == 200
+    result = r.json()
+    assert result["imported"] == 2
+    assert result["error_count"] == 2
+    assert [error["line"] for error in result["errors"]] == [2, 3]
+
+    body = 'title,description\nthird,"spans\ntwo lines"\n,missing title\nfourth,\n'
+
+    def chunks() -> Iterator[bytes]:
+        # Split mid-row and mid-quote to exercise incremental parsing
+        data = body.encode()
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    r = client.post(url, headers=headers, params={"format": "csv"}, content=chunks())
+    assert r.status_code == 200
+    result = r.json()
+    assert result["imported"] == 2
+    assert result["errors"][0]["line"] == 4
+
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+    items = {item["title"]: item["description"] for item in r.json()["data"]}
+    assert items == {
+        "first": "one",
+        "second": None,
+        "third": "spans\ntwo lines",
+        "fourth": "",
+    }
+
+
+def test_import_items_long_lines(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/items/import"
+
+    def chunks(body: str) -> Iterator[bytes]:
+        data = body.encode()
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    ndjson = "\n".join(
+        [
+            json.dumps({"title": "x" * 50}),
+            json.dumps({"title": "short"}),
+        ]
+    )
+    csv_body = "\n".join(
+        [
+            "title,description",
+            'a,"never closed',
+            "b,x",
+            "c,y",
+            "d,z",
+            "e,w",
+            "f,1",
+            "g," + "x" * 50,
+            "h,2",
+        ]
+    )
+    with patch.object(settings, "IMPORT_MAX_LINE_LENGTH", 30):
+        r = client.post(url, headers=normal_user_token_headers, content=chunks(ndjson))
+        assert r.status_code == 200
+        result = r.json()
+        assert result["imported"] == 1
+        assert result["errors"] == [
+            {"line": 1, "error": "Line longer than 30 characters"}
+        ]
+
+        r = client.post(
+            url,
+            headers=normal_user_token_headers,
+            params={"format": "csv"},
+            content=chunks(csv_body),
+        )
+    assert r.status_code == 200
+    result = r.json()
+    # The unterminated quote swallows lines up to the limit, then parsing
+    # resumes on the next line
+    assert result["imported"] == 2
+    assert result["errors"] == [
+        {"line": 2, "error": "Record longer than 30 characters"},
+        {"line": 8, "error": "Line longer than 30 characters"},
+    ]
+
+
+def test_search_items(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    in_description = crud.create_item(
+        session=db,
+        item_in=ItemCreate(title="Quarterly notes", description="the walrus report"),
+        owner_id=user.id,
+    )
+    in_title = crud.create_item(
+        session=db,
+        item_in=ItemCreate(title="Walrus migration", description="seasonal"),
+        owner_id=user.id,
+    )
+    crud.create_item(
+        session=db, item_in=ItemCreate(title="Unrelated"), owner_id=user.id
+    )
+    other = create_random_item(db)
+    other.title = "walrus"
+    db.add(other)
+    db.commit()
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    url = f"{settings.API_V1_STR}/items/search"
+
+    r = client.get(url, headers=headers, params={"q": "walruses"})
+    assert r.status_code == 200
+    content = r.json()
+    assert [item["id"] for item in content["data"]] == [
+        str(in_title.id),
+        str(in_description.id),
+    ]
+    assert content["count"] is None
+
+    r = client.get(url, headers=headers, params={"q": "walrus", "limit": 1})
+    assert [item["id"] for item in r.json()["data"]] == [str(in_title.id)]
+    r = client.get(
+        url,
+        headers=headers,
+        params={"q": "walrus", "limit": 1, "cursor": r.json()["next_cursor"]},
+    )
+    assert [item["id"] for item in r.json()["data"]] == [str(in_description.id)]
+
+    r = client.get(url, headers=headers, params={"q": "walrus -report"})
+    assert [item["id"] for item in r.json()["data"]] == [str(in_title.id)]
+
+
+def test_suggest_items(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    for title in ["Roadmap 2027", "road_trip", "roadworks", "Railway"]:
+        crud.create_item(session=db, item_in=ItemCreate(title=title), owner_id=user.id)
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    url = f"{settings.API_V1_STR}/items/suggest"
+
+    r = client.get(url, headers=headers, params={"prefix": "road"})
+    assert r.status_code == 200
+    assert sorted(r.json()["data"]) == ["Roadmap 2027", "road_trip", "roadworks"]
+
+    # _ is matched literally, not as a wildcard
+    r = client.get(url, headers=headers, params={"prefix": "road_"})
+    assert r.json()["data"] == ["road_trip"]
+
+    # A cached prefix sees items created through the API right away
+    r = client.post(
+        f"{settings.API_V1_STR}/items/", headers=headers, json={"title": "roadside"}
+    )
+    assert r.status_code == 200
+    r = client.get(url, headers=headers, params={"prefix": "ROAD"})
+    assert "roadside" in r.json()["data"]
+
+    r = client.get(url, headers=headers, params={"prefix": ""})
+    assert r.status_code == 422
+
+
+def test_read_item_conditional_get(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    item = create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/{item.id}"
+
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    r = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == etag
+    assert r.content == b""
+
+    r = client.put(url, headers=superuser_token_headers, json={"title": "changed"})
+    assert r.status_code == 200
+    r = client.get(url, headers={**superuser_token_headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    assert r.json()["title"] == "changed"
+
+
+def test_read_items_conditional_get(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    item = crud.create_item(
+        session=db, item_in=ItemCreate(title=random_lower_string()), owner_id=user.id
+    )
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    url = f"{settings.API_V1_STR}/items/"
+
+    r = client.get(url, headers=headers)
+    etag = r.headers["ETag"]
+    assert etag.startswith("W/")
+    r = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+
+    r = client.put(f"{url}{item.id}", headers=headers, json={"description": "new"})
+    assert r.status_code == 200
+    r = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+
+
+def test_read_items_response_cache(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    url = f"{settings.API_V1_STR}/items/"
+    hits = response_cache.hits
+
+    r = client.get(url, headers=headers)
+    assert r.json()["count"] == 0
+    r = client.get(url, headers=headers)
+    assert r.json()["count"] == 0
+    assert response_cache.hits == hits + 1
+
+    # Writes through the API drop the owner's cached pages
+    r = client.post(url, headers=headers, json={"title": "cached"})
+    assert r.status_code == 200
+    r = client.get(url, headers=headers)
+    assert r.json()["count"] == 1
+    assert r.json()["data"][0]["title"] == "cached"
+
+
+def test_item_writes_take_one_round_trip(client: TestClient, db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    item = crud.create_item(
+        session=db, item_in=ItemCreate(title=random_lower_string()), owner_id=user.id
+    )
+    other = create_random_item(db)
+    headers = user_authentication_headers(client=client, email=email, password=password)
+    # Warm the principal cache so authentication does not query
+    client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+
+    url = f"{settings.API_V1_STR}/items"
+    with count_statements() as statements:
+        r = client.put(f"{url}/{item.id}", headers=headers, json={"title": "new"})
+    assert r.status_code == 200
+    assert r.json()["title"] == "new"
+    assert len(statements) == 1
+
+    with count_statements() as statements:
+        r = client.put(f"{url}/{other.id}", headers=headers, json={"title": "new"})
+    assert r.status_code == 400
+    assert len(statements) == 1
+
+    with count_statements() as statements:
+        r = client.delete(f"{url}/{uuid.uuid4()}", headers=headers)
+    assert r.status_code == 404
+    assert len(statements) == 1
+
+    with count_statements() as statements:
+        r = client.delete(f"{url}/{item.id}", headers=headers)
+    assert r.status_code == 200
+    assert len(statements) == 1
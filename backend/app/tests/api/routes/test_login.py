@@ -1,12 +1,12 @@
 from unittest.mock import patch
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.core.config import settings
 from app.core.security import verify_password
 from app.crud import create_user
-from backend.app.schemas import UserCreate
+from app.schemas import EmailOutbox, UserCreate
 from app.tests.utils.user import user_authentication_headers
 from app.tests.utils.utils import random_email, random_lower_string
 from app.utils import generate_password_reset_token
@@ -33,6 +33,17 @@ def test_get_access_token_incorrect_password(client: TestClient) -> None:
     assert r.status_code == 400
 
 
+def test_get_access_token_hashing_saturated(client: TestClient) -> None:
+    login_data = {
+        "username": settings.FIRST_SUPERUSER,
+        "password": settings.FIRST_SUPERUSER_PASSWORD,
+    }
+    with patch("app.core.config.settings.PASSWORD_HASH_MAX_PENDING", 0):
+        r = client.post(f"{settings.API_V1_STR}/login/access-token", data=login_data)
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+
+
 def test_use_access_token(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
@@ -46,7 +57,7 @@ def test_use_access_token(
 
 
 def test_recovery_password(
-    client: TestClient, normal_user_token_headers: dict[str, str]
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
     with (
         patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
@@ -59,6 +70,10 @@ def test_recovery_password(
         )
         assert r.status_code == 200
         assert r.json() == {"message": "Password recovery email sent"}
+        queued = db.exec(
+            select(EmailOutbox).where(EmailOutbox.email_to == email)
+        ).all()
+        assert any("Password recovery" in message.subject for message in queued)
 
 
 def test_recovery_password_user_not_exits(
@@ -1,3 +1,4 @@
+import json
 import uuid
 from unittest.mock import patch
 
@@ -6,9 +7,11 @@ from sqlmodel import Session, select
 
 from app import crud
 from app.core.config import settings
-from app.core.security import verify_password
-from backend.app.schemas import User, UserCreate
-from app.tests.utils.utils import random_email, random_lower_string
+from app.core.purge import purge_engine
+from app.core.security import decode_access_token, verify_password
+from app.schemas import User, UserCreate
+from app.tests.utils.user import user_authentication_headers
+from app.tests.utils.utils import count_statements, random_email, random_lower_string
 
 
 def test_get_users_superuser_me(
@@ -33,6 +36,24 @@ def test_get_users_normal_user_me(
     assert current_user["email"] == settings.EMAIL_TEST_USER
 
 
+def test_get_users_me_conditional_get(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/users/me"
+    r = client.get(url, headers=normal_user_token_headers)
+    etag = r.headers["ETag"]
+    r = client.get(url, headers={**normal_user_token_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+
+    r = client.patch(
+        url, headers=normal_user_token_headers, json={"full_name": random_lower_string()}
+    )
+    assert r.status_code == 200
+    r = client.get(url, headers={**normal_user_token_headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+
+
 def test_create_user_new_email(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -168,6 +189,54 @@ def test_retrieve_users(
         assert "email" in item
 
 
+def test_export_users(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    email = random_email()
+    user_in = UserCreate(email=email, password=random_lower_string())
+    crud.create_user(session=db, user_create=user_in)
+
+    r = client.get(f"{settings.API_V1_STR}/users/export", headers=superuser_token_headers)
+    assert r.status_code == 200
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert email in {row["email"] for row in rows}
+    assert all("hashed_password" not in row for row in rows)
+
+
+def test_export_users_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/export", headers=normal_user_token_headers
+    )
+    assert r.status_code == 403
+
+
+def test_retrieve_users_cursor_pagination(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        user_in = UserCreate(email=random_email(), password=random_lower_string())
+        crud.create_user(session=db, user_create=user_in)
+
+    url = f"{settings.API_V1_STR}/users/"
+    r = client.get(url, headers=superuser_token_headers, params={"limit": 2})
+    first_page = r.json()
+    assert first_page["next_cursor"]
+    r = client.get(
+        url,
+        headers=superuser_token_headers,
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+    )
+    assert r.status_code == 200
+    second_page = r.json()
+
+    emails = [user["email"] for user in first_page["data"] + second_page["data"]]
+    assert len(emails) == 4
+    assert emails == sorted(emails)
+    assert len(set(emails)) == 4
+
+
 def test_update_user_me(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -346,6 +415,63 @@ def test_update_user(
     assert user_db.full_name == "Updated_full_name"
 
 
+def test_update_user_deactivation_invalidates_cached_principal(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    headers = user_authentication_headers(
+        client=client, email=username, password=password
+    )
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 200
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/{user.id}",
+        headers=superuser_token_headers,
+        json={"is_active": False},
+    )
+    assert r.status_code == 200
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 400
+    assert r.json() == {"detail": "Inactive user"}
+
+
+def test_claims_token_revoked_on_deactivation(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    username = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=username, password=password)
+    user = crud.create_user(session=db, user_create=user_in)
+    with patch("app.core.config.settings.ACCESS_TOKEN_CLAIMS", True):
+        headers = user_authentication_headers(
+            client=client, email=username, password=password
+        )
+        token = headers["Authorization"].removeprefix("Bearer ")
+        claims = decode_access_token(token)
+        assert claims.is_active is True
+        assert claims.is_superuser is False
+        assert claims.ver == 0
+
+        r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+        assert r.status_code == 200
+
+        r = client.patch(
+            f"{settings.API_V1_STR}/users/{user.id}",
+            headers=superuser_token_headers,
+            json={"is_active": False},
+        )
+        assert r.status_code == 200
+
+        r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+        assert r.status_code == 403
+        assert r.json() == {"detail": "Could not validate credentials"}
+
+
 def test_update_user_not_exists(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
@@ -405,13 +531,19 @@ def test_delete_user_me(client: TestClient, db: Session) -> None:
     assert r.status_code == 200
     deleted_user = r.json()
     assert deleted_user["message"] == "User deleted successfully"
+    db.expire_all()
+    pending = db.get(User, user_id)
+    assert pending
+    assert pending.is_active is False
+    assert pending.deletion_requested_at is not None
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code in (400, 401, 403)
+
+    client.portal.call(purge_engine.run_once)  # type: ignore[union-attr]
+    db.expire_all()
     result = db.exec(select(User).where(User.id == user_id)).first()
     assert result is None
 
-    user_query = select(User).where(User.id == user_id)
-    user_db = db.execute(user_query).first()
-    assert user_db is None
-
 
 def test_delete_user_me_as_superuser(
     client: TestClient, superuser_token_headers: dict[str, str]
@@ -440,6 +572,8 @@ def test_delete_user_super_user(
     assert r.status_code == 200
     deleted_user = r.json()
     assert deleted_user["message"] == "User deleted successfully"
+    client.portal.call(purge_engine.run_once)  # type: ignore[union-attr]
+    db.expire_all()
     result = db.exec(select(User).where(User.id == user_id)).first()
     assert result is None
 
@@ -484,3 +618,17 @@ def test_delete_user_without_privileges(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "The user doesn't have enough privileges"
+
+
+def test_update_user_me_takes_one_round_trip(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/users/me"
+    client.get(url, headers=normal_user_token_headers)
+    with count_statements() as statements:
+        r = client.patch(
+            url, headers=normal_user_token_headers, json={"full_name": "One Trip"}
+        )
+    assert r.status_code == 200
+    assert r.json()["full_name"] == "One Trip"
+    assert len(statements) == 1
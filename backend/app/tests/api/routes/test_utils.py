@@ -0,0 +1,62 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.core.principal_cache import invalidate_user
+
+
+def test_read_db_pool_status(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    superuser = crud.get_user_by_email(session=db, email=settings.FIRST_SUPERUSER)
+    assert superuser
+    # Make the request load the superuser, so it holds a connection
+    invalidate_user(superuser.id)
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    pools = {pool["name"]: pool for pool in r.json()}
+    assert set(pools) == {"sync", "async"}
+    async_pool = pools["async"]
+    assert async_pool["size"] == settings.DB_POOL_SIZE
+    assert async_pool["checked_out"] >= 1
+    assert async_pool["checkout_wait"]["count"] >= 1
+    assert async_pool["checkout_wait"]["buckets"][-1]["le"] is None
+
+
+def test_read_db_pool_status_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/db-pool/", headers=normal_user_token_headers
+    )
+    assert r.status_code == 403
+
+
+def test_read_principal_cache_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/utils/principal-cache/"
+    before = client.get(url, headers=superuser_token_headers).json()
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["hits"] == before["hits"] + 1
+    assert stats["maxsize"] == settings.PRINCIPAL_CACHE_SIZE
+
+
+def test_read_response_cache_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    client.get(f"{settings.API_V1_STR}/users/", headers=superuser_token_headers)
+    client.get(f"{settings.API_V1_STR}/users/", headers=superuser_token_headers)
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/response-cache/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["backend"] == "memory"
+    assert stats["hits"] >= 1
+    assert 0 < stats["hit_rate"] <= 1
@@ -0,0 +1,27 @@
+import json
+import uuid
+from types import SimpleNamespace
+
+from app.api.serialization import dump_page, public_fields
+from app.schemas import Item, ItemPublic, ItemsPublic
+
+
+def test_dump_page_matches_response_model() -> None:
+    owner_id = uuid.uuid4()
+    items = [
+        Item(title="first", description=None, owner_id=owner_id),
+        Item(title="sécond \"quoted\"", description="two", owner_id=owner_id),
+    ]
+    body = dump_page(items, public_fields(ItemPublic), count=2, next_cursor="abc")
+    expected = ItemsPublic(data=items, count=2, next_cursor="abc")  # type: ignore[arg-type]
+    assert json.loads(body) == json.loads(expected.model_dump_json())
+
+
+def test_dump_page_uuid_subclass() -> None:
+    # asyncpg returns its own uuid.UUID subclass, which orjson does not know
+    class DriverUUID(uuid.UUID):
+        pass
+
+    value = uuid.uuid4()
+    body = dump_page([SimpleNamespace(id=DriverUUID(str(value)))], ["id"])
+    assert json.loads(body) == {"data": [{"id": str(value)}]}
@@ -1,12 +1,15 @@
 from collections.abc import Generator
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
 from app.core.config import settings
 from app.core.db import engine, init_db
+from app.core.response_cache import MemoryBackend, response_cache
 from app.main import app
-from app.models import Item, User
+from app.schemas import EmailOutbox, Item, User
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
@@ -20,11 +23,26 @@ def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         init_db(session)
         yield session
+        session.execute(delete(EmailOutbox))
         session.execute(delete(Item))
         session.execute(delete(User))
         session.commit()
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache() -> Generator[None, None, None]:
+    """
+    Tests run in one process, so they use the in-memory response cache.
+    They also write rows through crud directly, which the cache does not
+    see, so each test starts with an empty one.
+    """
+    backend = MemoryBackend(
+        maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+    )
+    with patch.object(response_cache, "backend", backend):
+        yield
+
+
 @pytest.fixture(scope="module")
 def client() -> Generator[TestClient, None, None]:
     """
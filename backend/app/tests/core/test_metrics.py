@@ -0,0 +1,25 @@
+from app.core.metrics import Histogram
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.01, 0.05, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["count"] == 5
+    assert snapshot["sum"] == 3.565
+    assert snapshot["buckets"] == [
+        {"le": 0.01, "count": 2},
+        {"le": 0.1, "count": 3},
+        {"le": 1.0, "count": 4},
+        {"le": None, "count": 5},
+    ]
+
+
+def test_histogram_empty() -> None:
+    snapshot = Histogram(buckets=(1.0,)).snapshot()
+
+    assert snapshot["count"] == 0
+    assert snapshot["buckets"] == [{"le": 1.0, "count": 0}, {"le": None, "count": 0}]
@@ -0,0 +1,163 @@
+"""
+Email outbox delivery against a local aiosmtpd server.
+"""
+
+import threading
+import time
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, delete
+
+from app import crud
+from app.core.config import settings
+from app.core.outbox import DEAD, PENDING, OutboxSender
+from app.schemas import EmailOutbox
+from app.tests.utils.smtp import Sink, smtp_sink
+from app.tests.utils.utils import random_email
+from app.utils import EmailData
+
+
+@pytest.fixture
+def sink(db: Session) -> Generator[Sink, None, None]:
+    db.execute(delete(EmailOutbox))
+    db.commit()
+    with smtp_sink() as sink:
+        yield sink
+
+
+def _enqueue(db: Session) -> EmailOutbox:
+    message = crud.enqueue_email(
+        session=db,
+        email_to=random_email(),
+        email_data=EmailData(html_content="<p>hi</p>", subject="Hello"),
+    )
+    db.commit()
+    db.refresh(message)
+    return message
+
+
+def _sender(**kwargs: Any) -> OutboxSender:
+    options = {
+        "batch_size": 10,
+        "max_attempts": 3,
+        "backoff": 0.0,
+        "max_backoff": 0.0,
+        "lease": 60.0,
+        "concurrency": 2,
+        **kwargs,
+    }
+    return OutboxSender(**options)
+
+
+def test_outbox_delivers_and_removes(
+    client: TestClient, db: Session, sink: Sink
+) -> None:
+    message = _enqueue(db)
+    message_id, email_to = message.id, message.email_to
+    sender = _sender()
+    assert client.portal.call(sender.send_pending) == 1  # type: ignore[union-attr]
+    assert sink.recipients == [email_to]
+    db.expire_all()
+    assert db.get(EmailOutbox, message_id) is None
+    # Nothing left to send
+    assert client.portal.call(sender.send_pending) == 0  # type: ignore[union-attr]
+
+
+def test_outbox_retries_then_dead_letters(
+    client: TestClient, db: Session, sink: Sink
+) -> None:
+    sink.reply = "451 Try again later"
+    message = _enqueue(db)
+    sender = _sender(max_attempts=2)
+
+    assert client.portal.call(sender.send_pending) == 0  # type: ignore[union-attr]
+    db.expire_all()
+    retried = db.get(EmailOutbox, message.id)
+    assert retried
+    assert retried.status == PENDING
+    assert retried.attempts == 1
+    assert retried.last_error and "451" in retried.last_error
+
+    client.portal.call(sender.send_pending)  # type: ignore[union-attr]
+    db.expire_all()
+    dead = db.get(EmailOutbox, message.id)
+    assert dead
+    assert dead.status == DEAD
+    assert dead.attempts == 2
+    assert dead.html_content == ""
+    assert sink.recipients == []
+    assert sender.failed == 2
+
+
+def test_outbox_backoff_delays_retry(
+    client: TestClient, db: Session, sink: Sink
+) -> None:
+    sink.reply = "451 Try again later"
+    message = _enqueue(db)
+    sender = _sender(backoff=60.0, max_backoff=600.0)
+    client.portal.call(sender.send_pending)  # type: ignore[union-attr]
+
+    sink.reply = "250 OK"
+    assert client.portal.call(sender.send_pending) == 0  # type: ignore[union-attr]
+    db.expire_all()
+    assert db.get(EmailOutbox, message.id) is not None
+    assert sender.retry_delay(1).total_seconds() == 60
+    assert sender.retry_delay(3).total_seconds() == 240
+    assert sender.retry_delay(10).total_seconds() == 600
+
+
+def test_outbox_bounds_concurrent_sends(
+    client: TestClient, db: Session, sink: Sink
+) -> None:
+    for _ in range(6):
+        _enqueue(db)
+    lock = threading.Lock()
+    active, peak = 0, 0
+
+    def send_email(**_: Any) -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    sender = _sender(concurrency=2)
+    with patch("app.core.outbox.send_email", send_email):
+        assert client.portal.call(sender.send_pending) == 6  # type: ignore[union-attr]
+    assert peak == 2
+    assert sink.recipients == []
+
+
+def test_create_user_queues_email_with_user(
+    client: TestClient, superuser_token_headers: dict[str, str], sink: Sink
+) -> None:
+    email = random_email()
+    r = client.post(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        json={"email": email, "password": "password1234"},
+    )
+    assert r.status_code == 200
+    # Nothing is sent during the request
+    assert sink.recipients == []
+    client.portal.call(_sender().send_pending)  # type: ignore[union-attr]
+    assert sink.recipients == [email]
+
+
+def test_read_email_outbox_stats(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    db.execute(delete(EmailOutbox))
+    db.commit()
+    _enqueue(db)
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/email-outbox/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert r.json() == {"pending": 1, "dead": 0}
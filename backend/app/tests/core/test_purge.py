@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, func, select, update
+
+from app import crud
+from app.core.config import settings
+from app.core.purge import PurgeEngine
+from app.schemas import Item, ItemCreate, User
+from app.tests.utils.user import create_random_user
+
+
+def _item_count(db: Session, *where: object) -> int:
+    return db.exec(select(func.count()).select_from(Item).where(*where)).one()
+
+
+def test_purge_user_in_batches(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    for i in range(5):
+        crud.create_item(session=db, item_in=ItemCreate(title=f"t{i}"), owner_id=user.id)
+    db.exec(
+        update(User)
+        .where(col(User.id) == user.id)
+        .values(is_active=False, deletion_requested_at=func.now())
+    )
+    db.commit()
+
+    user_id = user.id
+    engine = PurgeEngine(batch_size=2, batch_delay=0)
+    client.portal.call(engine.purge_user, user_id)  # type: ignore[union-attr]
+
+    (progress,) = engine.progress()
+    assert progress["task"] == f"user:{user_id}"
+    assert progress["deleted"] == 5
+    assert progress["batches"] == 3
+    assert progress["done"] is True
+    db.expire_all()
+    assert _item_count(db, col(Item.owner_id) == user_id) == 0
+    assert db.get(User, user_id) is None
+
+
+def test_purge_user_keeps_active_user(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    engine = PurgeEngine(batch_size=2, batch_delay=0)
+    client.portal.call(engine.purge_user, user.id)  # type: ignore[union-attr]
+    db.expire_all()
+    assert db.get(User, user.id) is not None
+
+
+def test_reactivated_user_is_not_purged(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    user = create_random_user(db)
+    item = crud.create_item(session=db, item_in=ItemCreate(title="t"), owner_id=user.id)
+    user_id, item_id = user.id, item.id
+    db.exec(
+        update(User)
+        .where(col(User.id) == user_id)
+        .values(is_active=False, deletion_requested_at=func.now())
+    )
+    db.commit()
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/users/{user_id}",
+        headers=superuser_token_headers,
+        json={"is_active": True},
+    )
+    assert r.status_code == 200
+    engine = PurgeEngine(batch_size=2, batch_delay=0)
+    client.portal.call(engine.purge_user, user_id)  # type: ignore[union-attr]
+    db.expire_all()
+    reactivated = db.get(User, user_id)
+    assert reactivated
+    assert reactivated.deletion_requested_at is None
+    assert db.get(Item, item_id) is not None
+
+
+def test_retention(client: TestClient, db: Session) -> None:
+    user = create_random_user(db)
+    old = crud.create_item(session=db, item_in=ItemCreate(title="old"), owner_id=user.id)
+    new = crud.create_item(session=db, item_in=ItemCreate(title="new"), owner_id=user.id)
+    old_id, new_id = old.id, new.id
+    db.exec(
+        update(Item)
+        .where(col(Item.id) == old_id)
+        .values(created_at=datetime.now(timezone.utc) - timedelta(days=31))
+    )
+    db.commit()
+
+    engine = PurgeEngine(batch_size=100, batch_delay=0)
+    with patch.object(settings, "ITEM_RETENTION_DAYS", None):
+        client.portal.call(engine.apply_retention)  # type: ignore[union-attr]
+    assert engine.progress() == []
+
+    with patch.object(settings, "ITEM_RETENTION_DAYS", 30):
+        client.portal.call(engine.apply_retention)  # type: ignore[union-attr]
+    db.expire_all()
+    assert db.get(Item, old_id) is None
+    assert db.get(Item, new_id) is not None
+
+
+def test_read_purge_progress(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/purge/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    assert isinstance(r.json(), list)
+
+
+def test_read_purge_progress_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/purge/", headers=normal_user_token_headers
+    )
+    assert r.status_code == 403
@@ -0,0 +1,187 @@
+"""
+Replica routing tests.
+
+SQLite files stand in for the primary and replicas by default. To run against
+real servers, set REPLICA_TEST_PRIMARY_URI and REPLICA_TEST_REPLICA_URIS
+(comma separated) to async DSNs, e.g. postgresql+asyncpg://...
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, MetaData, String, Table, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.datastructures import State
+
+from app.api import deps
+from app.core import replicas
+from app.core.config import settings
+from app.core.db import make_async_engine
+from app.core.replicas import ReplicaSet, RoutingSession
+
+origin = Table("db_origin", MetaData(), Column("name", String(32)))
+
+Urls = tuple[str, list[str]]
+
+
+@pytest.fixture
+def urls(tmp_path: Path) -> Urls:
+    primary = os.environ.get("REPLICA_TEST_PRIMARY_URI")
+    replica_uris = os.environ.get("REPLICA_TEST_REPLICA_URIS")
+    if primary and replica_uris:
+        return primary, replica_uris.split(",")
+    return f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", [
+        f"sqlite+aiosqlite:///{tmp_path / f'replica-{i}.db'}" for i in range(2)
+    ]
+
+
+async def _label(engine: AsyncEngine, name: str) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(origin.metadata.create_all)
+        await connection.execute(delete(origin))
+        await connection.execute(insert(origin).values(name=name))
+
+
+def run_with_engines(
+    urls: Urls, test: Callable[[AsyncEngine, ReplicaSet], Awaitable[None]]
+) -> None:
+    async def main() -> None:
+        primary = create_async_engine(urls[0])
+        replica_set = ReplicaSet([create_async_engine(url) for url in urls[1]])
+        try:
+            await _label(primary, "primary")
+            for i, replica in enumerate(replica_set.engines):
+                await _label(replica, f"replica-{i}")
+            await test(primary, replica_set)
+        finally:
+            await primary.dispose()
+            await replica_set.dispose()
+
+    asyncio.run(main())
+
+
+def routing_session(primary: AsyncEngine, replica: AsyncEngine | None) -> AsyncSession:
+    session = AsyncSession(primary, sync_session_class=RoutingSession)
+    session.info["replica"] = replica
+    return session
+
+
+async def _names(session: AsyncSession) -> list[str]:
+    return list((await session.scalars(select(origin.c.name))).all())
+
+
+def test_reads_go_to_replica(urls: Urls) -> None:
+    async def test(primary: AsyncEngine, replica_set: ReplicaSet) -> None:
+        async with routing_session(primary, replica_set.engines[0]) as session:
+            assert await _names(session) == ["replica-0"]
+        async with routing_session(primary, None) as session:
+            assert await _names(session) == ["primary"]
+
+    run_with_engines(urls, test)
+
+
+def test_writes_and_later_reads_go_to_primary(urls: Urls) -> None:
+    async def test(primary: AsyncEngine, replica_set: ReplicaSet) -> None:
+        async with routing_session(primary, replica_set.engines[0]) as session:
+            await session.exec(insert(origin).values(name="written"))  # type: ignore[call-overload]
+            assert sorted(await _names(session)) == ["primary", "written"]
+            await session.commit()
+        async with routing_session(primary, replica_set.engines[0]) as session:
+            assert await _names(session) == ["replica-0"]
+
+    run_with_engines(urls, test)
+
+
+def test_round_robin(urls: Urls) -> None:
+    if len(urls[1]) < 2:
+        pytest.skip("needs two replicas")
+
+    async def test(_primary: AsyncEngine, replica_set: ReplicaSet) -> None:
+        chosen = [replica_set.choose() for _ in range(4)]
+        assert chosen == [*replica_set.engines[:2], *replica_set.engines[:2]]
+
+    run_with_engines(urls, test)
+
+
+def test_unhealthy_replica_is_skipped(urls: Urls, tmp_path: Path) -> None:
+    async def test(_primary: AsyncEngine, replica_set: ReplicaSet) -> None:
+        good = replica_set.engines[0]
+        bad = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"
+        )
+        checked = ReplicaSet([good, bad])
+        await checked.check_health()
+        assert checked.is_healthy(good)
+        assert not checked.is_healthy(bad)
+        assert {checked.choose() for _ in range(4)} == {good}
+        await bad.dispose()
+
+    run_with_engines(urls, test)
+
+
+def test_commit_flags_request_as_writer(urls: Urls) -> None:
+    async def test(primary: AsyncEngine, replica_set: ReplicaSet) -> None:
+        reader, writer = State(), State()
+        async with routing_session(primary, replica_set.engines[0]) as session:
+            session.info["request_state"] = reader
+            await _names(session)
+            await session.commit()
+        async with routing_session(primary, None) as session:
+            session.info["request_state"] = writer
+            await session.exec(insert(origin).values(name="written"))  # type: ignore[call-overload]
+            await session.commit()
+        assert not getattr(reader, "wrote_to_primary", False)
+        assert writer.wrote_to_primary
+
+    run_with_engines(urls, test)
+
+
+def test_sticky_cookie() -> None:
+    cookie = replicas.sticky_cookie(time.time() + 5)
+    assert replicas.sticks_to_primary(cookie)
+    assert not replicas.sticks_to_primary(None)
+    assert not replicas.sticks_to_primary(replicas.sticky_cookie(time.time() - 1))
+    value, _, signature = cookie.rpartition(".")
+    assert not replicas.sticks_to_primary(f"{float(value) + 60:.3f}.{signature}")
+    assert not replicas.sticks_to_primary("garbage")
+
+
+def test_write_response_sticks_any_worker_to_primary(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The primary stands in for a replica; what matters is the routing
+    replica = make_async_engine(str(settings.SQLALCHEMY_ASYNC_DATABASE_URI))
+    monkeypatch.setattr(replicas, "replica_set", ReplicaSet([replica]))
+    routed: list[AsyncEngine | None] = []
+
+    def spy(method: str, sticky: bool) -> AsyncEngine | None:
+        routed.append(replicas.replica_for(method, sticky))
+        return routed[-1]
+
+    monkeypatch.setattr(deps, "replica_for", spy)
+    url = f"{settings.API_V1_STR}/items/"
+    try:
+        r = client.post(url, headers=superuser_token_headers, json={"title": "t"})
+        assert r.status_code == 200
+        cookie = r.cookies[replicas.STICKY_COOKIE]
+        # Nothing is remembered server-side: without the cookie the next
+        # read goes to a replica, with it (whichever worker or container
+        # answers) to the primary
+        client.cookies.clear()
+        client.get(url, headers=superuser_token_headers)
+        client.cookies.set(replicas.STICKY_COOKIE, cookie)
+        client.get(url, headers=superuser_token_headers)
+        assert routed == [None, replica, None]
+        r = client.get(url, headers=superuser_token_headers)
+        assert replicas.STICKY_COOKIE not in r.cookies
+    finally:
+        client.cookies.clear()
+        client.portal.call(replica.dispose)  # type: ignore[union-attr]
@@ -0,0 +1,81 @@
+import asyncio
+import uuid
+from typing import Any
+
+import pytest
+
+from app.core.response_cache import (
+    CachedResponse,
+    MemoryBackend,
+    ResponseCache,
+    ResponseCacheBackend,
+    SharedBackend,
+)
+
+
+class FakeRedis:
+    """
+    Local stand-in for the asyncio Redis client used by SharedBackend.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    async def get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: Any, px: int | None = None) -> None:
+        self.data[key] = value
+
+    async def incr(self, key: str) -> int:
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return int(self.data[key])
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [MemoryBackend(maxsize=100, ttl=60), SharedBackend(FakeRedis())],
+    ids=["memory", "shared"],
+)
+def test_response_cache_invalidation(backend: ResponseCacheBackend) -> None:
+    cache = ResponseCache(backend, ttl=60)
+    user_id = uuid.uuid4()
+    params = [("limit", "10"), ("skip", "0")]
+
+    response = CachedResponse(body=b'{"data":[]}', etag='W/"1"')
+
+    async def lookup(params: list[tuple[str, str]]) -> CachedResponse | None:
+        return await cache.get(await cache.key("items:a", user_id, "items", params))
+
+    async def scenario() -> None:
+        key = await cache.key("items:a", user_id, "items", params)
+        assert await cache.get(key) is None
+        await cache.set(key, response)
+
+        # Parameter order does not matter
+        assert await lookup(params[::-1]) == response
+
+        # Other scopes are left alone
+        await cache.invalidate("items:b")
+        assert await lookup(params) == response
+
+        await cache.invalidate("items:a")
+        assert await lookup(params) is None
+
+    asyncio.run(scenario())
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_response_cache_disabled() -> None:
+    cache = ResponseCache(None, ttl=60)
+
+    async def scenario() -> None:
+        key = await cache.key("users", uuid.uuid4(), "users", [])
+        assert key is None
+        await cache.set(key, CachedResponse(body=b"{}", etag='W/"1"'))
+        assert await cache.get(key) is None
+
+    asyncio.run(scenario())
+    assert cache.stats()["backend"] == "none"
@@ -0,0 +1,46 @@
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, col, delete
+
+from app.core.config import settings
+from app.core.revocation import REVOKED, RevocationList
+from app.schemas import User
+from app.tests.utils.user import create_random_user
+
+
+def test_revocation_list() -> None:
+    revocations = RevocationList()
+    user_id = uuid.uuid4()
+    assert not revocations.is_revoked(user_id, 0)
+
+    revocations.revoke(user_id, 2)
+    assert revocations.is_revoked(user_id, 1)
+    assert not revocations.is_revoked(str(user_id), 2)
+
+    # An older revocation never lowers the minimum version
+    revocations.revoke(user_id, 1)
+    assert revocations.is_revoked(user_id, 1)
+
+    revocations.revoke(user_id)
+    assert revocations.is_revoked(user_id, REVOKED - 1)
+    assert len(revocations) == 1
+
+
+def test_refresh_keeps_deleted_users_until_tokens_expire(
+    client: TestClient, db: Session
+) -> None:
+    user = create_random_user(db)
+    user_id = user.id
+    revocations = RevocationList()
+    revocations.revoke(user_id)
+    db.execute(delete(User).where(col(User.id) == user_id))
+    db.commit()
+
+    client.portal.call(revocations.refresh)  # type: ignore[union-attr]
+    assert revocations.is_revoked(user_id, 0)
+
+    with patch.object(settings, "ACCESS_TOKEN_EXPIRE_MINUTES", 0):
+        client.portal.call(revocations.refresh)  # type: ignore[union-attr]
+    assert not revocations.is_revoked(user_id, 0)
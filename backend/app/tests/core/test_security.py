@@ -0,0 +1,65 @@
+import asyncio
+import os
+from datetime import timedelta
+
+import jwt
+import pytest
+from jwt.exceptions import InvalidTokenError
+
+from app.core import security
+from app.core.config import settings
+
+
+def test_password_hash_pool_roundtrip() -> None:
+    async def roundtrip() -> tuple[bool, bool]:
+        hashed = await security.get_password_hash_async("correct horse")
+        return (
+            await security.verify_password_async("correct horse", hashed),
+            await security.verify_password_async("wrong horse", hashed),
+        )
+
+    assert asyncio.run(roundtrip()) == (True, False)
+    stats = security.password_hash_pool_stats()
+    assert stats["in_flight"] == 0
+    assert stats["latency"]["count"] >= 3
+
+
+def test_password_hash_pool_does_not_fork_the_caller() -> None:
+    parent = security._get_hash_executor().submit(os.getppid).result()
+    assert parent != os.getpid()
+
+
+def test_password_hash_pool_rejects_when_saturated(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    rejected = security.password_hash_pool_stats()["rejected"]
+
+    with pytest.raises(security.PasswordHashQueueFull):
+        asyncio.run(security.get_password_hash_async("correct horse"))
+
+    assert security.password_hash_pool_stats()["rejected"] == rejected + 1
+
+
+def test_decode_access_token_is_cached() -> None:
+    token = security.create_access_token("cached-subject", timedelta(minutes=5))
+    hits = security.token_cache_stats()["hits"]
+
+    first = security.decode_access_token(token)
+    second = security.decode_access_token(token)
+
+    assert first.sub == "cached-subject"
+    assert second is first
+    assert security.token_cache_stats()["hits"] == hits + 1
+
+
+def test_decode_access_token_rejects_expired_and_forged() -> None:
+    expired = security.create_access_token("expired", timedelta(seconds=-1))
+    with pytest.raises(InvalidTokenError):
+        security.decode_access_token(expired)
+    with pytest.raises(InvalidTokenError):
+        security.decode_access_token(expired)
+
+    forged = jwt.encode({"sub": "forged"}, "not-the-secret", algorithm="HS256")
+    with pytest.raises(InvalidTokenError):
+        security.decode_access_token(forged)
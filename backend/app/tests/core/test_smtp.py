@@ -0,0 +1,89 @@
+import smtplib
+
+import pytest
+
+from app.core.smtp import SMTPPool
+from app.tests.utils.smtp import (
+    Sink,
+    free_port,
+    running_sink,
+    smtp_settings,
+    smtp_sink,
+)
+
+MESSAGE = "Subject: hi\r\n\r\nhello\r\n"
+
+
+def _pool(**kwargs: float) -> SMTPPool:
+    options = {"size": 2, "idle_timeout": 60.0, "max_messages": 100, **kwargs}
+    return SMTPPool(**options)  # type: ignore[arg-type]
+
+
+def test_pool_reuses_connection() -> None:
+    pool = _pool()
+    with smtp_sink() as sink:
+        for i in range(5):
+            pool.send("noreply@example.com", [f"user{i}@example.com"], MESSAGE)
+        pool.close()
+    assert sink.recipients == [f"user{i}@example.com" for i in range(5)]
+    stats = pool.stats()
+    assert stats["connects"] == 1
+    assert stats["open"] == 0
+    assert stats["latency"]["count"] == 5
+
+
+def test_pool_max_messages_per_connection() -> None:
+    pool = _pool(max_messages=2)
+    with smtp_sink():
+        for _ in range(5):
+            pool.send("noreply@example.com", ["user@example.com"], MESSAGE)
+        assert pool.stats()["connects"] == 3
+        pool.close()
+
+
+def test_pool_idle_timeout() -> None:
+    pool = _pool(idle_timeout=0.0)
+    with smtp_sink():
+        for _ in range(3):
+            pool.send("noreply@example.com", ["user@example.com"], MESSAGE)
+        assert pool.stats()["connects"] == 3
+        assert pool.stats()["open"] == 1
+
+
+def test_pool_refused_message_keeps_connection() -> None:
+    pool = _pool()
+    with smtp_sink() as sink:
+        sink.reply = "550 No such user"
+        with pytest.raises(smtplib.SMTPDataError):
+            pool.send("noreply@example.com", ["user@example.com"], MESSAGE)
+        sink.reply = "250 OK"
+        pool.send("noreply@example.com", ["user@example.com"], MESSAGE)
+        pool.close()
+    assert pool.stats()["connects"] == 1
+
+
+def test_pool_reconnects_after_server_restart() -> None:
+    pool = _pool()
+    port = free_port()
+    first, second = Sink(), Sink()
+    with smtp_settings(port):
+        with running_sink(first, port):
+            pool.send("noreply@example.com", ["first@example.com"], MESSAGE)
+        # The pooled connection now points at a server that went away
+        with running_sink(second, port):
+            pool.send("noreply@example.com", ["second@example.com"], MESSAGE)
+            pool.close()
+    assert first.recipients == ["first@example.com"]
+    assert second.recipients == ["second@example.com"]
+    stats = pool.stats()
+    assert stats["connects"] == 2
+    assert stats["reconnects"] == 1
+
+
+def test_pool_connection_refused() -> None:
+    pool = _pool()
+    with smtp_settings(free_port()):
+        with pytest.raises(OSError):
+            pool.send("noreply@example.com", ["user@example.com"], MESSAGE)
+    assert pool.stats()["open"] == 0
+    assert pool.stats()["latency"]["count"] == 1
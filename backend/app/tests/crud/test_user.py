@@ -3,7 +3,7 @@ from sqlmodel import Session
 
 from app import crud
 from app.core.security import verify_password
-from backend.app.schemas import User, UserCreate, UserUpdate
+from app.schemas import User, UserCreate, UserUpdate
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -89,3 +89,23 @@ def test_update_user(db: Session) -> None:
     assert user_2
     assert user.email == user_2.email
     assert verify_password(new_password, user_2.hashed_password)
+
+
+def test_flush_bumps_version_in_sql(db: Session) -> None:
+    user = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    assert user.version == 1
+    # Another writer bumps the row while this session holds an old copy
+    with Session(db.get_bind()) as other:
+        other_user = other.get(User, user.id)
+        assert other_user
+        other_user.full_name = "Other"
+        other.commit()
+
+    user.full_name = "Stale"
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    assert user.version == 3
@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from jinja2 import Template
+
+from app.utils import (
+    email_templates,
+    precompile_email_templates,
+    render_email_template,
+    render_email_templates,
+)
+
+BUILD = Path(__file__).parents[1] / "email-templates" / "build"
+
+
+def test_precompile_email_templates() -> None:
+    assert precompile_email_templates() == len(list(BUILD.glob("*.html")))
+    template = email_templates().get_template("test_email.html")
+    assert email_templates().get_template("test_email.html") is template
+
+
+def test_render_email_template_matches_source() -> None:
+    context = {"project_name": "Project", "email": "someone@example.com"}
+    expected = Template((BUILD / "test_email.html").read_text()).render(context)
+    html = render_email_template(template_name="test_email.html", context=context)
+    assert html == expected
+
+
+def test_render_email_templates() -> None:
+    contexts = [
+        {"project_name": "Project", "email": f"user{i}@example.com"} for i in range(3)
+    ]
+    rendered = render_email_templates(
+        template_name="test_email.html", contexts=contexts
+    )
+    assert rendered == [
+        render_email_template(template_name="test_email.html", context=context)
+        for context in contexts
+    ]
+    assert "user2@example.com" in rendered[2]
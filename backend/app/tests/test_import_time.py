@@ -0,0 +1,65 @@
+"""
+Cold import of app.main, which every new worker pays before serving.
+
+Runs in a fresh interpreter with only the web framework imported, so the
+budget covers what the app adds and not the speed of the machine at
+importing FastAPI. Set IMPORT_TIME_BUDGET_MS to tune the ceiling.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+
+BACKEND = Path(__file__).parents[2]
+
+# Only needed on first use: error reporting, sending and rendering email,
+# and password hashing
+LAZY_MODULES = ("sentry_sdk", "emails", "jinja2", "passlib")
+
+# Imported by any app on this stack, and preloaded before measuring
+FRAMEWORK = (
+    "fastapi",
+    "fastapi.routing",
+    "fastapi.security",
+    "pydantic_settings",
+    "sqlalchemy.ext.asyncio",
+    "sqlmodel",
+)
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=BACKEND,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_us(importtime: str, module: str) -> int:
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in importtime.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} missing from -X importtime output")
+
+
+def test_import_time_budget() -> None:
+    result = _run(f"import {', '.join(FRAMEWORK)}; import app.main", "-X", "importtime")
+    milliseconds = _cumulative_us(result.stderr, "app.main") / 1000
+    assert milliseconds <= settings.IMPORT_TIME_BUDGET_MS, (
+        f"importing app.main took {milliseconds:.0f} ms, "
+        f"budget is {settings.IMPORT_TIME_BUDGET_MS} ms"
+    )
+
+
+def test_heavy_dependencies_are_lazy() -> None:
+    result = _run(
+        "import sys, app.main; print(*sorted(m.partition('.')[0] for m in sys.modules))"
+    )
+    loaded = set(result.stdout.split())
+    assert loaded.isdisjoint(LAZY_MODULES), loaded & set(LAZY_MODULES)
@@ -0,0 +1,163 @@
+"""
+app.launcher: worker sizing, and a real supervisor with recycled workers.
+"""
+
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.launcher import (
+    WORKER_BOOT_ERROR,
+    cgroup_cpu_limit,
+    rss_bytes,
+    worker_count,
+)
+
+BACKEND = Path(__file__).parents[2]
+
+
+def test_worker_count_from_settings() -> None:
+    with patch.object(settings, "WEB_CONCURRENCY", 3):
+        assert worker_count() == 3
+
+
+def test_worker_count_from_cpus() -> None:
+    with patch.object(settings, "WEB_CONCURRENCY", None):
+        assert 1 <= worker_count() <= (os.cpu_count() or 1)
+
+
+@pytest.mark.parametrize(
+    ("cpu_max", "limit"),
+    [
+        ("max 100000", None),
+        ("200000 100000", 2),
+        ("150000 100000", 2),
+        ("1 100000", 1),
+    ],
+)
+def test_cgroup_cpu_limit(tmp_path: Path, cpu_max: str, limit: int | None) -> None:
+    path = tmp_path / "cpu.max"
+    path.write_text(f"{cpu_max}\n")
+    assert cgroup_cpu_limit(path) == limit
+
+
+def test_cgroup_cpu_limit_without_cgroup(tmp_path: Path) -> None:
+    assert cgroup_cpu_limit(tmp_path / "missing") is None
+
+
+def test_rss_bytes() -> None:
+    assert rss_bytes() > 1 << 20
+
+
+def test_launcher_refuses_memory_cache_with_several_workers() -> None:
+    env = {**os.environ, "WEB_CONCURRENCY": "2", "RESPONSE_CACHE_BACKEND": "memory"}
+    result = subprocess.run(
+        [sys.executable, "-m", "app.launcher"],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 1
+    assert "RESPONSE_CACHE_BACKEND=memory" in result.stderr
+
+
+def test_launcher_gives_up_on_workers_that_fail_to_boot() -> None:
+    env = {
+        **os.environ,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(_free_port()),
+        "WEB_CONCURRENCY": "1",
+        "WORKER_MAX_BOOT_FAILURES": "3",
+        # Workers load the revocation list before serving, from nowhere
+        "ACCESS_TOKEN_CLAIMS": "true",
+        "POSTGRES_PORT": str(_free_port()),
+    }
+    start = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, "-m", "app.launcher"],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == WORKER_BOOT_ERROR
+    assert result.stderr.count("Started worker") == 3
+    assert "3 workers in a row failed to boot" in result.stderr
+    # Respawned after 1s and then 2s
+    assert time.monotonic() - start > 3
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def _workers(pid: int) -> set[int]:
+    children = Path(f"/proc/{pid}/task/{pid}/children").read_text()
+    return {int(child) for child in children.split()}
+
+
+@pytest.fixture
+def launcher() -> Generator[tuple[str, subprocess.Popen[bytes]], None, None]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "SERVER_HOST": "127.0.0.1",
+        "SERVER_PORT": str(port),
+        "WEB_CONCURRENCY": "2",
+        "WORKER_MAX_REQUESTS": "3",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.launcher"], cwd=BACKEND, env=env
+    )
+    url = f"http://127.0.0.1:{port}{settings.API_V1_STR}/utils/health-check/"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(url)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise
+                time.sleep(0.2)
+        yield url, process
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+@pytest.mark.skipif(
+    not Path(f"/proc/{os.getpid()}/task/{os.getpid()}/children").exists(),
+    reason="lists workers through /proc",
+)
+def test_launcher_recycles_workers_and_stops_gracefully(
+    launcher: tuple[str, subprocess.Popen[bytes]],
+) -> None:
+    url, process = launcher
+    first = _workers(process.pid)
+    assert len(first) == 2
+
+    # Workers check their request count every 0.1s
+    for _ in range(12):
+        assert httpx.get(url).status_code == 200
+        time.sleep(0.2)
+    assert _workers(process.pid) - first
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=settings.WORKER_GRACEFUL_TIMEOUT_SECONDS + 5) == 0
@@ -1,7 +1,7 @@
 from sqlmodel import Session
 
 from app import crud
-from backend.app.schemas import Item, ItemCreate
+from app.schemas import Item, ItemCreate
 from app.tests.utils.user import create_random_user
 from app.tests.utils.utils import random_lower_string
 
@@ -0,0 +1,74 @@
+import socket
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import Any
+from unittest.mock import patch
+
+from aiosmtpd.controller import Controller
+
+from app.core.config import settings
+from app.core.smtp import smtp_pool
+
+
+class Sink:
+    """
+    aiosmtpd handler that records recipients and answers DATA with ``reply``.
+    """
+
+    def __init__(self) -> None:
+        self.reply = "250 OK"
+        self.recipients: list[str] = []
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:
+        if self.reply.startswith("250"):
+            self.recipients.extend(envelope.rcpt_tos)
+        return self.reply
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port: int = s.getsockname()[1]
+        return port
+
+
+@contextmanager
+def running_sink(sink: Sink, port: int) -> Generator[Controller, None, None]:
+    controller = Controller(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        yield controller
+    finally:
+        controller.stop()
+
+
+@contextmanager
+def smtp_settings(port: int) -> Generator[None, None, None]:
+    """
+    Point the email settings at a plain SMTP server on localhost.
+    """
+    with (
+        patch.object(settings, "SMTP_HOST", "127.0.0.1"),
+        patch.object(settings, "SMTP_PORT", port),
+        patch.object(settings, "SMTP_TLS", False),
+        patch.object(settings, "SMTP_SSL", False),
+        patch.object(settings, "SMTP_USER", None),
+        patch.object(settings, "SMTP_PASSWORD", None),
+        patch.object(settings, "EMAILS_FROM_EMAIL", "noreply@example.com"),
+    ):
+        try:
+            yield
+        finally:
+            # Pooled connections point at this server
+            smtp_pool.close()
+
+
+@contextmanager
+def smtp_sink() -> Generator[Sink, None, None]:
+    """
+    A local SMTP server, with the email settings pointing at it.
+    """
+    sink = Sink()
+    port = free_port()
+    with running_sink(sink, port), smtp_settings(port):
+        yield sink
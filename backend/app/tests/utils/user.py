@@ -3,7 +3,7 @@ from sqlmodel import Session
 
 from app import crud
 from app.core.config import settings
-from backend.app.schemas import User, UserCreate, UserUpdate
+from app.schemas import User, UserCreate, UserUpdate
 from app.tests.utils.utils import random_email, random_lower_string
 
 
@@ -1,33 +1,75 @@
 import logging
+import smtplib
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import emails  # type: ignore
 import jwt
-from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
 
 from app.core import security
 from app.core.config import settings
+from app.core.smtp import smtp_pool
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class EmailDeliveryError(Exception):
+    pass
+
+
 @dataclass
 class EmailData:
     html_content: str
     subject: str
 
 
+@cache
+def email_templates() -> "Environment":
+    # The built templates only change on deploy, so they are loaded and
+    # compiled once per process; the bytecode cache lets new workers skip the
+    # compile too. jinja2 is imported on first use to keep startup fast.
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    return Environment(
+        loader=FileSystemLoader(Path(__file__).parent / "email-templates" / "build"),
+        bytecode_cache=FileSystemBytecodeCache(settings.EMAIL_TEMPLATE_CACHE_DIR),
+        auto_reload=False,
+    )
+
+
+def precompile_email_templates() -> int:
+    """
+    Compile every email template ahead of the first email. Returns the number
+    of templates compiled.
+    """
+    environment = email_templates()
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
-    return html_content
+    return email_templates().get_template(template_name).render(context)
+
+
+def render_email_templates(
+    *, template_name: str, contexts: Iterable[Mapping[str, Any]]
+) -> list[str]:
+    """
+    Render one template against many contexts, e.g. for bulk notifications.
+    The template is looked up once and shared by every render.
+    """
+    template = email_templates().get_template(template_name)
+    return [template.render(context) for context in contexts]
 
 
 def send_email(
@@ -37,22 +79,20 @@ def send_email(
     html_content: str = "",
 ) -> None:
     assert settings.emails_enabled, "no provided configuration for email variables"
+    assert settings.EMAILS_FROM_EMAIL
+    import emails  # type: ignore
+
     message = emails.Message(
         subject=subject,
         html=html_content,
         mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
+        mail_to=email_to,
     )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
-    logger.info(f"send email result: {response}")
+    try:
+        smtp_pool.send(settings.EMAILS_FROM_EMAIL, [email_to], message.as_string())
+    except (smtplib.SMTPException, OSError) as e:
+        raise EmailDeliveryError(str(e)) from e
+    logger.info(f"sent email to {email_to}")
 
 
 def generate_test_email(email_to: str) -> EmailData:
@@ -0,0 +1,73 @@
+"""
+Compare requests/sec of the blocking Session path against the AsyncSession path.
+
+Both endpoints run the same query as the superuser branch of ``read_items``.
+Requests are driven in-process through ``httpx.ASGITransport`` so the numbers
+reflect the server side only: the sync endpoint runs on anyio's worker thread
+pool, the async one on the event loop.
+
+Run from ``backend/`` against a migrated database:
+
+    python benchmarks/bench_async_db.py --concurrency 200 --duration 10
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlmodel import select
+
+from app.api.deps import AsyncSessionDep, SessionDep
+from app.core.db import async_engine
+from app.schemas import Item
+
+app = FastAPI()
+
+
+@app.get("/sync")
+def read_items_sync(session: SessionDep) -> int:
+    return len(session.exec(select(Item).limit(100)).all())
+
+
+@app.get("/async")
+async def read_items_async(session: AsyncSessionDep) -> int:
+    return len((await session.exec(select(Item).limit(100))).all())
+
+
+async def run(path: str, concurrency: int, duration: float) -> float:
+    transport = httpx.ASGITransport(app=app)
+    completed = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker() -> None:
+            nonlocal completed
+            while time.perf_counter() < deadline:
+                response = await client.get(path)
+                response.raise_for_status()
+                completed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return completed / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    for path in ("/sync", "/async"):
+        rps = await run(path, args.concurrency, args.duration)
+        print(f"{path:<8} {rps:10.1f} req/s  (concurrency={args.concurrency})")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+Latency of a deep page of GET /items/ with offset and with cursor paging.
+
+Seeds --rows items for one throwaway user (INSERT ... SELECT
+generate_series, so a million rows take seconds), then times fetching page
+--page both ways. Run from ``backend/`` against a migrated database:
+
+    python benchmarks/bench_pagination.py --rows 1000000 --page 1000
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session, col, delete, select
+
+from app.core.db import engine
+from app.core.pagination import encode_cursor
+from app.core.security import create_access_token
+from app.main import app
+from app.schemas import Item, User
+
+
+def seed(session: Session, rows: int) -> User:
+    user = User(email=f"bench-{uuid.uuid4().hex}@example.com", hashed_password="-")
+    session.add(user)
+    session.commit()
+    session.execute(
+        text(
+            "INSERT INTO item (id, title, description, owner_id) "
+            "SELECT gen_random_uuid(), 'item ' || n, NULL, :owner_id "
+            "FROM generate_series(1, :rows) AS n"
+        ),
+        {"owner_id": user.id, "rows": rows},
+    )
+    session.commit()
+    session.execute(text("ANALYZE item"))
+    return user
+
+
+def timed(client: TestClient, headers: dict[str, str], params: dict[str, object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        r = client.get("/api/v1/items/", headers=headers, params=params)
+        samples.append(time.perf_counter() - start)
+        r.raise_for_status()
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        user = seed(session, args.rows)
+        skip = (args.page - 1) * args.limit
+        # The key of the row just before the page stands in for the cursor a
+        # client would have received with the previous page.
+        before = session.exec(
+            select(Item.owner_id, Item.id)
+            .where(Item.owner_id == user.id)
+            .order_by(col(Item.owner_id), col(Item.id))
+            .offset(skip - 1)
+            .limit(1)
+        ).one()
+        token = create_access_token(user.id, timedelta(hours=1))
+        headers = {"Authorization": f"Bearer {token}"}
+
+        try:
+            with TestClient(app) as client:
+                offset = timed(client, headers, {"skip": skip, "limit": args.limit}, args.repeat)
+                cursor = timed(
+                    client,
+                    headers,
+                    {"cursor": encode_cursor(before), "limit": args.limit},
+                    args.repeat,
+                )
+        finally:
+            session.exec(delete(Item).where(col(Item.owner_id) == user.id))  # type: ignore
+            session.delete(user)
+            session.commit()
+
+    print(f"page {args.page} of {args.rows} rows, limit {args.limit}")
+    print(f"offset {offset * 1000:8.1f} ms")
+    print(f"cursor {cursor * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Throughput of app.utils.send_email against a local SMTP sink (aiosmtpd).
+
+"before" is what send_email used to do: emails.Message.send, which opens,
+greets and quits a connection per message; "after" sends through
+app.core.smtp.smtp_pool. Use --latency to add a delay per SMTP reply and
+approximate a remote relay.
+
+    python benchmarks/bench_smtp.py --messages 500 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import emails  # type: ignore
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP
+
+from app.core.smtp import smtp_pool
+from app.tests.utils.smtp import Sink, free_port, smtp_settings
+from app.utils import send_email
+
+
+class SlowSMTP(SMTP):
+    latency = 0.0
+
+    async def push(self, status: str) -> None:
+        await asyncio.sleep(self.latency)
+        await super().push(status)
+
+
+class SlowController(Controller):
+    def factory(self) -> SMTP:
+        return SlowSMTP(self.handler, **self.SMTP_kwargs)
+
+
+def before(port: int, email_to: str) -> None:
+    message = emails.Message(
+        subject="Benchmark", html="<p>hi</p>", mail_from="noreply@example.com"
+    )
+    response = message.send(to=email_to, smtp={"host": "127.0.0.1", "port": port})
+    assert response.status_code == 250
+
+
+def after(email_to: str) -> None:
+    send_email(email_to=email_to, subject="Benchmark", html_content="<p>hi</p>")
+
+
+def run(send: Callable[[str], None], messages: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [
+            executor.submit(send, f"user{i}@example.com") for i in range(messages)
+        ]:
+            future.result()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=smtp_pool.size)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    SlowSMTP.latency = args.latency
+    sink = Sink()
+    port = free_port()
+    controller = SlowController(sink, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        with smtp_settings(port):
+            for name, send in (("before", partial(before, port)), ("after", after)):
+                seconds = run(send, args.messages, args.concurrency)
+                print(
+                    f"{name:<7} {args.messages / seconds:8.0f} messages/s"
+                    f"  {seconds / args.messages * 1e3:8.2f} ms/message"
+                )
+            latency = smtp_pool.stats()["latency"]
+            print(f"pool    {smtp_pool.stats()['connects']} connections")
+            print(f"        {latency['sum'] / latency['count'] * 1e3:.2f} ms mean send")
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":
+    main()
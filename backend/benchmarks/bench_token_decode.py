@@ -0,0 +1,48 @@
+"""
+Per-request cost of turning a bearer token into a TokenPayload.
+
+"before" is what get_current_user used to do on every request (HMAC check,
+JSON decode and pydantic validation); "after" is a warm hit in
+app.core.security.decode_access_token.
+
+    python benchmarks/bench_token_decode.py --number 200000
+"""
+
+import argparse
+import timeit
+from datetime import timedelta
+
+import jwt
+
+from app.core import security
+from app.core.config import settings
+from app.schemas import TokenPayload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    token = security.create_access_token(
+        "8a6e0804-2bd0-4672-b79d-d97027f9071a",
+        timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+
+    def before() -> TokenPayload:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
+        )
+        return TokenPayload(**payload)
+
+    def after() -> TokenPayload:
+        return security.decode_access_token(token)
+
+    after()  # warm the cache
+    for name, func in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(func, number=args.number, repeat=5))
+        print(f"{name:<7} {seconds / args.number * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()